@@ -5,8 +5,10 @@ Defaults are defined here. Users can override by creating ~/.cctools/config.json
 """
 
 import json
+from functools import cache
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 # Default configuration values
 DEFAULTS = {
@@ -27,31 +29,31 @@ DEFAULTS = {
     "codex_resume_extra_args": [],
 }
 
-_config_cache: Optional[dict[str, Any]] = None
+_config_cache: Optional[Mapping[str, Any]] = None
 
 
 def _load_user_config() -> dict[str, Any]:
     """Load user config from ~/.cctools/config.json if it exists."""
     config_path = Path.home() / ".cctools" / "config.json"
-    if config_path.exists():
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
-    return {}
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
 
 
-def get_config() -> dict[str, Any]:
+def get_config() -> Mapping[str, Any]:
     """
     Get merged configuration (defaults + user overrides).
 
     Returns:
-        Dict with all config values
+        Read-only mapping with all config values
     """
     global _config_cache
     if _config_cache is None:
-        _config_cache = {**DEFAULTS, **_load_user_config()}
+        _config_cache = MappingProxyType(
+            {**DEFAULTS, **_load_user_config()}
+        )
     return _config_cache
 
 
@@ -70,7 +72,7 @@ def get(key: str, default: Any = None) -> Any:
     return config.get(key, default)
 
 
-def reload_config() -> dict[str, Any]:
+def reload_config() -> Mapping[str, Any]:
     """
     Reload configuration from disk (clears cache).
 
@@ -79,20 +81,26 @@ def reload_config() -> dict[str, Any]:
     """
     global _config_cache
     _config_cache = None
+    for accessor in _CACHED_ACCESSORS:
+        accessor.cache_clear()
     return get_config()
 
 
-# Convenience accessors for common settings
+# Convenience accessors for common settings.
+# String accessors are memoized; reload_config() clears them.
+@cache
 def claude_subagent_model() -> str:
     """Get model name for Claude sub-agents during context rollover."""
     return get("claude_subagent_model", DEFAULTS["claude_subagent_model"])
 
 
+@cache
 def codex_rollover_model() -> str:
     """Get model name for Codex context rollover (analysis step)."""
     return get("codex_rollover_model", DEFAULTS["codex_rollover_model"])
 
 
+@cache
 def codex_default_model() -> str:
     """Get model name for Codex interactive session after rollover.
 
@@ -101,16 +109,27 @@ def codex_default_model() -> str:
     return get("codex_default_model", DEFAULTS["codex_default_model"])
 
 
+@cache
 def claude_command() -> str:
     """Get the command/binary name used to launch Claude."""
     return get("claude_command", DEFAULTS["claude_command"])
 
 
+@cache
 def codex_command() -> str:
     """Get the command/binary name used to launch Codex."""
     return get("codex_command", DEFAULTS["codex_command"])
 
 
+_CACHED_ACCESSORS = (
+    claude_subagent_model,
+    codex_rollover_model,
+    codex_default_model,
+    claude_command,
+    codex_command,
+)
+
+
 def claude_resume_extra_args() -> list[str]:
     """Get extra arguments passed when resuming a Claude session."""
     val = get("claude_resume_extra_args", DEFAULTS["claude_resume_extra_args"])
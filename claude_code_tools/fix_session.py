@@ -19,130 +19,263 @@ Usage as CLI:
     # Fix and write to new file
     fix-session f8ddc --fix --output fixed.jsonl
 
+    # Fix every session in a project directory, in parallel
+    fix-session --batch ~/.claude/projects/my-project --fix
+
 Usage as library:
     from claude_code_tools.fix_session import check_and_fix_session
     needed_fix = check_and_fix_session(Path("session.jsonl"))
 """
 
-import argparse
+import hashlib
 import json
-import shutil
+import os
+import re
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Optional
 
-from claude_code_tools.session_utils import resolve_session_path
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Entry types that form the actual conversation chain
-CONVERSATION_TYPES = {"user", "assistant", "system", "summary"}
+CONVERSATION_TYPES = frozenset({"user", "assistant", "system", "summary"})
+
+# Number of entries serialized per write() call in write_session
+WRITE_CHUNK_SIZE = 4096
+
+# A run of 19+ digits may be an integer outside the 64-bit range,
+# which orjson would silently turn into a float
+_LONG_DIGITS = re.compile(rb"\d{19}")
 
 
 def load_session(filepath: str | Path) -> list[dict]:
-    """Load all entries from a session JSONL file."""
+    """Load all entries from a session JSONL file.
+
+    Reads raw bytes line by line; both orjson and json accept
+    bytes with a trailing newline, so lines are parsed as-is.
+    Lines orjson rejects (e.g. an escaped lone surrogate from a
+    truncated string) or might misread (very large integers) are
+    parsed with the stdlib json module instead.
+    """
     entries = []
-    with open(filepath, encoding="utf-8") as f:
+    append = entries.append
+    with open(filepath, "rb") as f:
+        if not ORJSON_AVAILABLE:
+            for line in f:
+                if not line.isspace():
+                    append(json.loads(line))
+            return entries
+
+        loads = orjson.loads
+        decode_error = orjson.JSONDecodeError
+        long_digits = _LONG_DIGITS.search
         for line in f:
-            line = line.strip()
-            if line:
-                entries.append(json.loads(line))
+            if line.isspace():
+                continue
+            if long_digits(line) is None:
+                try:
+                    append(loads(line))
+                    continue
+                except decode_error:
+                    pass
+            append(json.loads(line))
     return entries
 
 
 def is_conversation_entry(entry: dict) -> bool:
-    """Check if entry is part of the conversation chain."""
+    """Check if entry is part of the conversation chain.
+
+    analyze_session inlines this check in its entry loop.
+    """
     return entry.get("type") in CONVERSATION_TYPES
 
 
+def _walk_chain(
+    last_conv: dict,
+    get_conv: Callable[[str], Optional[dict]],
+    all_uuid_to_entry: dict[str, dict],
+    max_length: int,
+) -> tuple[int, Optional[dict]]:
+    """Walk parentUuid links back from the last conversation entry.
+
+    The walk stops after ``max_length`` steps, which is only reached
+    when the parentUuid links form a cycle.
+
+    Args:
+        last_conv: Conversation entry to start from.
+        get_conv: Returns the conversation entry for a UUID, or
+            None if the UUID is not a conversation entry.
+        all_uuid_to_entry: UUID map over all entries, used to
+            describe the entry a broken link points at.
+        max_length: Upper bound on the chain length, normally the
+            number of conversation entries.
+
+    Returns:
+        Tuple of (chain_length, chain_break). chain_break is None
+        when the walk reaches a root entry.
+    """
+    chain_length = 0
+    chain_break = None
+    current = last_conv
+    while current:
+        chain_length += 1
+        parent = current.get("parentUuid")
+        if not parent:
+            break  # Reached root
+        parent_conv = get_conv(parent)
+        if parent_conv is None:
+            chain_break = _chain_break_info(
+                current, all_uuid_to_entry, chain_length
+            )
+            break
+        current = parent_conv
+        if chain_length >= max_length:
+            break
+    return chain_length, chain_break
+
+
+def _chain_break_info(
+    entry: dict, all_uuid_to_entry: dict[str, dict], after_length: int
+) -> dict:
+    """Describe a chain break at ``entry`` (whose parent is orphaned)."""
+    parent = entry["parentUuid"]
+    parent_entry = all_uuid_to_entry.get(parent)
+    return {
+        "after_length": after_length,
+        "orphan_parent": parent,
+        "parent_type": (
+            parent_entry.get("type")
+            if parent_entry
+            else "MISSING"
+        ),
+        "current_entry_type": entry.get("type"),
+    }
+
+
 def analyze_session(entries: list[dict]) -> dict:
     """Analyze session for chain breaks.
 
     Returns comprehensive analysis including:
 
-    - All entries and conversation entries
+    - All entries and conversation entries (the latter as
+      parallel ``conv_file_idx`` / ``conv_entry`` lists)
     - UUID mappings
     - Chain analysis from the end
     - Orphan detection
     """
-    # Separate conversation entries
-    conv_entries = [
-        (i, e)
-        for i, e in enumerate(entries)
-        if is_conversation_entry(e)
-    ]
-
-    # Build UUID maps
-    all_uuid_to_entry = {
-        e["uuid"]: e for e in entries if "uuid" in e
-    }
-    conv_uuid_to_entry = {
-        e["uuid"]: e for i, e in conv_entries if "uuid" in e
-    }
-    conv_uuid_to_idx = {
-        e["uuid"]: idx
-        for idx, e in conv_entries
-        if "uuid" in e
-    }
+    # Separate conversation entries (as parallel arrays of file
+    # index and entry) and build UUID maps in one pass
+    conv_file_idx = []
+    conv_entry = []
+    all_uuid_to_entry = {}
+    conv_uuid_to_entry = {}
+    conv_uuid_to_idx = {}
+    # file_idx -> UUID of the preceding conversation entry
+    prev_conv_uuid_for = {}
+    last_conv_uuid = None
+    # Chain depth per conversation UUID, and the entry at the bottom
+    # of that chain (None for a root, else the entry whose parent is
+    # not a preceding conversation entry)
+    chain_depth = {}
+    chain_origin = {}
+    depth = 0
+    origin = None
+    # Set when a conversation UUID repeats; the chain walk then uses
+    # the last entry per UUID, which the file-order depths may not
+    duplicate_conv_uuid = False
+    # Local bindings for the per-entry loop
+    _CT = CONVERSATION_TYPES
+    conv_file_idx_append = conv_file_idx.append
+    conv_entry_append = conv_entry.append
+    for i, e in enumerate(entries):
+        e_get = e.get
+        t = e_get("type")
+        u = e_get("uuid")
+        if u is not None:
+            all_uuid_to_entry[u] = e
+        if t in _CT:
+            conv_file_idx_append(i)
+            conv_entry_append(e)
+            prev_conv_uuid_for[i] = last_conv_uuid
+            parent = e_get("parentUuid")
+            if not parent:
+                depth, origin = 1, None
+            elif parent in chain_depth:
+                depth = chain_depth[parent] + 1
+                origin = chain_origin[parent]
+            else:
+                depth, origin = 1, e
+            if u is not None:
+                if u in conv_uuid_to_entry:
+                    duplicate_conv_uuid = True
+                chain_depth[u] = depth
+                chain_origin[u] = origin
+                conv_uuid_to_entry[u] = e
+                conv_uuid_to_idx[u] = i
+                last_conv_uuid = u
 
     # Find conversation entries with orphan parents
     orphan_conv_entries = []
-    for file_idx, entry in conv_entries:
+    cue = conv_uuid_to_entry
+    aue_get = all_uuid_to_entry.get
+    orphans_append = orphan_conv_entries.append
+    for k in range(len(conv_entry)):
+        entry = conv_entry[k]
         parent = entry.get("parentUuid")
-        if parent and parent not in conv_uuid_to_entry:
-            parent_entry = all_uuid_to_entry.get(parent)
+        if parent and parent not in cue:
+            parent_entry = aue_get(parent)
             parent_type = (
                 parent_entry.get("type")
                 if parent_entry
                 else "MISSING"
             )
-            orphan_conv_entries.append(
+            orphans_append(
                 {
-                    "file_idx": file_idx,
+                    "file_idx": conv_file_idx[k],
                     "entry": entry,
                     "orphan_parent": parent,
                     "parent_type": parent_type,
                 }
             )
 
-    # Walk conversation chain from end
-    chain_length = 0
+    # Chain from the end: depth of the last conversation entry
+    chain_length = depth
     chain_break = None
-    if conv_entries:
-        _, last_conv = conv_entries[-1]
-        current = last_conv
-        while current:
-            chain_length += 1
-            parent = current.get("parentUuid")
-            if not parent:
-                break  # Reached root
-            if parent not in conv_uuid_to_entry:
-                parent_entry = all_uuid_to_entry.get(parent)
-                chain_break = {
-                    "after_length": chain_length,
-                    "orphan_parent": parent,
-                    "parent_type": (
-                        parent_entry.get("type")
-                        if parent_entry
-                        else "MISSING"
-                    ),
-                    "current_entry_type": current.get("type"),
-                }
-                break
-            current = conv_uuid_to_entry[parent]
-            if chain_length > 10000:
-                break
+    if duplicate_conv_uuid or (
+        origin is not None and origin["parentUuid"] in conv_uuid_to_entry
+    ):
+        # A reused UUID, or a parent that is a conversation entry
+        # later in the file, makes file-order depths unreliable;
+        # walk the links instead
+        chain_length, chain_break = _walk_chain(
+            conv_entry[-1],
+            conv_uuid_to_entry.get,
+            all_uuid_to_entry,
+            len(conv_entry),
+        )
+    elif origin is not None:
+        chain_break = _chain_break_info(
+            origin, all_uuid_to_entry, chain_length
+        )
 
     return {
         "entries": entries,
-        "conv_entries": conv_entries,
+        "conv_file_idx": conv_file_idx,
+        "conv_entry": conv_entry,
         "all_uuid_to_entry": all_uuid_to_entry,
         "conv_uuid_to_entry": conv_uuid_to_entry,
         "conv_uuid_to_idx": conv_uuid_to_idx,
+        "prev_conv_uuid_for": prev_conv_uuid_for,
         "orphan_conv_entries": orphan_conv_entries,
         "chain_length": chain_length,
         "chain_break": chain_break,
         "stats": {
             "total_entries": len(entries),
-            "conversation_entries": len(conv_entries),
+            "conversation_entries": len(conv_entry),
             "orphan_count": len(orphan_conv_entries),
             "chain_length": chain_length,
         },
@@ -150,14 +283,19 @@ def analyze_session(entries: list[dict]) -> dict:
 
 
 def find_previous_conversation_uuid(
-    conv_entries: list[tuple[int, dict]],
+    conv_entries: Iterable[tuple[int, dict]],
     file_idx: int,
 ) -> Optional[str]:
     """Find the UUID of the previous conversation entry.
 
+    This rescans ``conv_entries`` on every call; inside this module
+    the ``prev_conv_uuid_for`` map from :func:`analyze_session` is
+    used instead.
+
     Args:
-        conv_entries: List of (file_idx, entry) tuples for
-            conversation entries.
+        conv_entries: (file_idx, entry) pairs for conversation
+            entries, e.g. ``zip(analysis["conv_file_idx"],
+            analysis["conv_entry"])``.
         file_idx: Current entry's index in the full file.
 
     Returns:
@@ -181,132 +319,380 @@ def fix_conversation_chain(
     For each conversation entry whose parentUuid points to a
     non-conversation entry, relink it to the previous
     conversation entry in file order.
+
+    Only relinked entries are copied; all other items in the
+    returned list are the original dicts and must not be mutated.
     """
     entries = analysis["entries"]
-    conv_entries = analysis["conv_entries"]
-    fixed = [e.copy() for e in entries]
+    prev_conv_uuid_for = analysis["prev_conv_uuid_for"]
+    fixed = list(entries)
 
     fixes_made = 0
     for orphan_info in analysis["orphan_conv_entries"]:
         file_idx = orphan_info["file_idx"]
-        prev_conv_uuid = find_previous_conversation_uuid(
-            conv_entries, file_idx
-        )
-
-        if prev_conv_uuid:
-            fixed[file_idx]["parentUuid"] = prev_conv_uuid
-        else:
-            # This is the first conversation entry
-            fixed[file_idx]["parentUuid"] = None
+        # None when this is the first conversation entry
+        prev_conv_uuid = prev_conv_uuid_for.get(file_idx) or None
+        fixed[file_idx] = {
+            **entries[file_idx],
+            "parentUuid": prev_conv_uuid,
+        }
         fixes_made += 1
 
     return fixed, fixes_made
 
 
+def _dumps_line(entry: dict) -> bytes:
+    """Serialize one entry as a compact JSONL line (stdlib)."""
+    return (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _fixed_indices(analysis: dict) -> list[int]:
+    """File indices that fix_conversation_chain relinks."""
+    return [o["file_idx"] for o in analysis["orphan_conv_entries"]]
+
+
+def verify_fix(
+    analysis: dict,
+    fixed: list[dict],
+    fixed_indices: Iterable[int],
+) -> dict:
+    """Check a fixed session without re-running analyze_session.
+
+    Fixing only rewrites parentUuid on the orphan entries, so the
+    UUID maps in ``analysis`` still hold. Only the relinked entries
+    need to be rechecked, plus one walk of the chain from the end.
+
+    Args:
+        analysis: Result of analyze_session on the original entries.
+        fixed: Entries returned by fix_conversation_chain.
+        fixed_indices: File indices of the relinked entries.
+
+    Returns:
+        Dict with ``orphan_conv_entries``, ``chain_length``,
+        ``chain_break`` and ``stats`` in the same shape as
+        analyze_session.
+    """
+    conv_uuid_to_entry = analysis["conv_uuid_to_entry"]
+    all_uuid_to_entry = analysis["all_uuid_to_entry"]
+    entries = analysis["entries"]
+
+    orphan_conv_entries = []
+    # Relinked copies that replace what their UUID resolves to; with a
+    # repeated UUID only the last entry counts, as in analyze_session
+    relinked = {}
+    for file_idx in fixed_indices:
+        entry = fixed[file_idx]
+        uuid = entry.get("uuid")
+        if (
+            uuid is not None
+            and conv_uuid_to_entry.get(uuid) is entries[file_idx]
+        ):
+            relinked[uuid] = entry
+        parent = entry.get("parentUuid")
+        if parent and parent not in conv_uuid_to_entry:
+            parent_entry = all_uuid_to_entry.get(parent)
+            orphan_conv_entries.append(
+                {
+                    "file_idx": file_idx,
+                    "entry": entry,
+                    "orphan_parent": parent,
+                    "parent_type": (
+                        parent_entry.get("type")
+                        if parent_entry
+                        else "MISSING"
+                    ),
+                }
+            )
+
+    def get_conv(uuid: str) -> Optional[dict]:
+        return relinked.get(uuid) or conv_uuid_to_entry.get(uuid)
+
+    chain_length = 0
+    chain_break = None
+    conv_file_idx = analysis["conv_file_idx"]
+    if conv_file_idx:
+        chain_length, chain_break = _walk_chain(
+            fixed[conv_file_idx[-1]],
+            get_conv,
+            all_uuid_to_entry,
+            len(conv_file_idx),
+        )
+
+    return {
+        "orphan_conv_entries": orphan_conv_entries,
+        "chain_length": chain_length,
+        "chain_break": chain_break,
+        "stats": {
+            **analysis["stats"],
+            "orphan_count": len(orphan_conv_entries),
+            "chain_length": chain_length,
+        },
+    }
+
+
 def write_session(entries: list[dict], filepath: str | Path) -> None:
-    """Write entries to a JSONL file."""
-    with open(filepath, "w", encoding="utf-8") as f:
-        for e in entries:
-            f.write(json.dumps(e, separators=(",", ":")) + "\n")
+    """Write entries to a JSONL file.
+
+    Lines are serialized to bytes and written in batches of
+    WRITE_CHUNK_SIZE entries to keep the number of writes low.
+    With orjson, non-ASCII text is written as raw UTF-8 rather than
+    \\uXXXX escapes; entries orjson cannot encode (lone surrogates,
+    integers outside 64 bits) are written by the stdlib encoder.
+    """
+    if ORJSON_AVAILABLE:
+        dumps = orjson.dumps
+        encode_error = orjson.JSONEncodeError
+        nl = b"\n"
+
+        def dump_line(e: dict) -> bytes:
+            try:
+                return dumps(e) + nl
+            except encode_error:
+                return _dumps_line(e)
+    else:
+        dump_line = _dumps_line
+
+    with open(filepath, "wb") as f:
+        for start in range(0, len(entries), WRITE_CHUNK_SIZE):
+            chunk = entries[start:start + WRITE_CHUNK_SIZE]
+            f.write(b"".join([dump_line(e) for e in chunk]))
 
 
 def print_analysis(
     analysis: dict, verbose: bool = False
 ) -> None:
-    """Print analysis results."""
+    """Print analysis results (as a single write to stdout)."""
     stats = analysis["stats"]
 
-    print("Session Analysis:")
-    print(f"  Total entries: {stats['total_entries']}")
-    print(
+    lines = [
+        "Session Analysis:",
+        f"  Total entries: {stats['total_entries']}",
         f"  Conversation entries: "
-        f"{stats['conversation_entries']}"
-    )
-    print(
+        f"{stats['conversation_entries']}",
         f"  Orphan parents in conversation: "
-        f"{stats['orphan_count']}"
-    )
-    print(
-        f"  Chain length from end: {stats['chain_length']}"
-    )
+        f"{stats['orphan_count']}",
+        f"  Chain length from end: {stats['chain_length']}",
+    ]
 
     if analysis["chain_break"]:
         cb = analysis["chain_break"]
-        print(f"\n  CHAIN BREAK detected:")
-        print(f"  Breaks after {cb['after_length']} entries")
-        print(f"  Orphan parent type: {cb['parent_type']}")
-        print(
+        lines += [
+            "\n  CHAIN BREAK detected:",
+            f"  Breaks after {cb['after_length']} entries",
+            f"  Orphan parent type: {cb['parent_type']}",
             f"  Current entry type: "
-            f"{cb['current_entry_type']}"
-        )
-        print(
+            f"{cb['current_entry_type']}",
             f"  Orphan parent UUID: "
-            f"{cb['orphan_parent'][:20]}..."
-        )
+            f"{cb['orphan_parent'][:20]}...",
+        ]
 
     if stats["orphan_count"] == 0:
-        print(
+        lines.append(
             "\n  No orphan references in conversation "
             "chain - session is healthy!"
         )
-        return
-
-    if verbose:
-        print(f"\nOrphan entries (showing first 10):")
+    elif verbose:
+        lines.append("\nOrphan entries (showing first 10):")
         for info in analysis["orphan_conv_entries"][:10]:
             entry = info["entry"]
-            print(
+            lines += [
                 f"\n  Line {info['file_idx']}: "
-                f"type={entry.get('type')}"
-            )
-            print(
+                f"type={entry.get('type')}",
                 f"    uuid: "
-                f"{entry.get('uuid', 'none')[:20]}..."
-            )
-            print(
+                f"{entry.get('uuid', 'none')[:20]}...",
                 f"    orphan parent: "
-                f"{info['orphan_parent'][:20]}..."
-            )
-            print(
-                f"    parent type: {info['parent_type']}"
-            )
+                f"{info['orphan_parent'][:20]}...",
+                f"    parent type: {info['parent_type']}",
+            ]
 
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def check_and_fix_session(session_path: Path) -> bool:
-    """Programmatic API: auto-fix a session in place.
 
-    Analyzes the session for orphan parent references. If any
-    are found, fixes them in place (creating a .bak backup)
-    and prints a brief summary.
-
-    Args:
-        session_path: Path to the session JSONL file.
+def _backup_session(
+    session_path: str | Path, backup: str | Path
+) -> None:
+    """Snapshot a session file before rewriting it.
+
+    Hardlinks the backup to the session file, which copies no data.
+    This is only a snapshot because the fixed session is then
+    written via _replace_session, which swaps in a new inode and
+    leaves the old one to the backup. Falls back to a data copy
+    (e.g. across filesystems or where hardlinks are unsupported).
+    A symlinked session is snapshotted through to its target. The
+    snapshot is made under a temporary name and renamed over the
+    backup, so an earlier backup survives a failed snapshot.
+    """
+    source = Path(session_path).resolve()
+    backup = Path(backup)
+    tmp = backup.with_name(f".{backup.name}.{os.getpid()}.tmp")
+    try:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(source, tmp)
+        except OSError:
+            import shutil
+
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, backup)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _replace_session(
+    entries: list[dict], session_path: str | Path
+) -> list[int]:
+    """Atomically replace a session file with ``entries``.
+
+    Writes to a temporary file beside the session and renames it
+    over the original, keeping the original's permission bits. A
+    symlinked session is resolved first, so its target is replaced
+    and the link is left in place.
 
     Returns:
-        True if fixes were needed and applied, False if the
-        session was already healthy.
+        Stat key of the file as written, taken before the rename so
+        it never describes a later writer's version.
     """
-    if not session_path.exists():
-        return False
+    session_path = Path(session_path).resolve()
+    tmp = session_path.with_name(
+        f".{session_path.name}.{os.getpid()}.tmp"
+    )
+    try:
+        write_session(entries, tmp)
+        try:
+            os.chmod(tmp, os.stat(session_path).st_mode & 0o7777)
+        except OSError:
+            pass
+        written_key = _stat_key(os.stat(tmp))
+        os.replace(tmp, session_path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return written_key
+
+
+def _fix_cache_dir() -> Path:
+    """Directory holding one healthy-session cache entry per session."""
+    return Path.home() / ".cctools" / "fix_session_cache"
+
+
+def _fix_cache_entry(resolved: str) -> Path:
+    """Cache entry file for a resolved session path."""
+    digest = hashlib.sha1(
+        resolved.encode("utf-8", "surrogateescape")
+    ).hexdigest()
+    return _fix_cache_dir() / f"{digest}.json"
+
+
+def _read_fix_cache_entry(entry_path: Path) -> Optional[dict]:
+    """Load one cache entry, or None if missing or unreadable."""
+    try:
+        with open(entry_path, "rb") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) else None
 
-    entries = load_session(session_path)
+
+def _cached_healthy_key(resolved: str) -> Optional[list]:
+    """Stat key of the version of a session last found healthy."""
+    entry = _read_fix_cache_entry(_fix_cache_entry(resolved))
+    if entry is None or entry.get("path") != resolved:
+        return None
+    return entry.get("key")
+
+
+def _write_fix_cache_entry(resolved: str, key: list[int]) -> None:
+    """Atomically record a healthy session version (best effort)."""
+    path = _fix_cache_entry(resolved)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"path": resolved, "key": key}, f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _prune_fix_cache() -> None:
+    """Drop cache entries whose session file no longer exists."""
+    try:
+        entry_paths = list(_fix_cache_dir().glob("*.json"))
+    except OSError:
+        return
+    for entry_path in entry_paths:
+        entry = _read_fix_cache_entry(entry_path)
+        session = entry.get("path") if entry else None
+        if isinstance(session, str) and os.path.exists(session):
+            continue
+        try:
+            os.unlink(entry_path)
+        except OSError:
+            pass
+
+
+def _stat_key(st: os.stat_result) -> list[int]:
+    """Cache key identifying one version of a file."""
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _current_key(session_path: Path) -> Optional[list[int]]:
+    """Stat key of a session file, or None if it cannot be stat'ed."""
+    try:
+        return _stat_key(os.stat(session_path))
+    except OSError:
+        return None
+
+
+def _check_and_fix_uncached(
+    session_path: Path,
+) -> tuple[bool, Optional[list[int]]]:
+    """Check and fix one session without touching the cache.
+
+    Returns:
+        Tuple of (needed_fix, healthy_key). healthy_key is the stat
+        key of the version found healthy, else None. It is taken
+        before parsing, so a version appended to during the check is
+        never cached as healthy.
+    """
+    parsed_key = _current_key(session_path)
+    try:
+        entries = load_session(session_path)
+    except FileNotFoundError:
+        return False, None
     analysis = analyze_session(entries)
 
     if analysis["stats"]["orphan_count"] == 0:
-        return False
+        return False, parsed_key
 
     # Apply fixes
     fixed, fixes_made = fix_conversation_chain(analysis)
 
     # Verify
-    verify = analyze_session(fixed)
+    verify = verify_fix(analysis, fixed, _fixed_indices(analysis))
 
     # Create backup and write
     backup = session_path.with_suffix(
         session_path.suffix + ".bak"
     )
-    shutil.copy2(session_path, backup)
-    write_session(fixed, session_path)
+    _backup_session(session_path, backup)
+    written_key = _replace_session(fixed, session_path)
+    healthy_key = (
+        written_key if verify["stats"]["orphan_count"] == 0 else None
+    )
 
     # Brief summary
     chain_status = (
@@ -322,11 +708,107 @@ def check_and_fix_session(session_path: Path) -> bool:
         f"{session_path.name} ({chain_status})"
     )
 
-    return True
+    return True, healthy_key
+
+
+def check_and_fix_session(session_path: Path) -> bool:
+    """Programmatic API: auto-fix a session in place.
+
+    Analyzes the session for orphan parent references. If any
+    are found, fixes them in place (creating a .bak backup)
+    and prints a brief summary.
+
+    Args:
+        session_path: Path to the session JSONL file.
+
+    Returns:
+        True if fixes were needed and applied, False if the
+        session was already healthy.
+
+    Sessions found healthy are remembered by (mtime, size), one
+    small entry per session under ~/.cctools/fix_session_cache/,
+    so unchanged files are skipped without being parsed again.
+    """
+    try:
+        st = os.stat(session_path)
+    except FileNotFoundError:
+        return False
+    resolved = str(session_path.resolve())
+    if _cached_healthy_key(resolved) == _stat_key(st):
+        return False
+
+    needed_fix, healthy_key = _check_and_fix_uncached(session_path)
+    if healthy_key is not None:
+        _write_fix_cache_entry(resolved, healthy_key)
+    return needed_fix
+
+
+def check_and_fix_sessions(
+    paths: Iterable[Path],
+    workers: Optional[int] = None,
+) -> list[bool]:
+    """Run check_and_fix_session over many files in parallel.
+
+    The healthy-session cache is only read and written here, in the
+    calling process: sessions unchanged since they were last found
+    healthy are skipped, and the rest are parsed and fixed
+    independently in worker processes. With a single worker or a
+    single file to check, everything runs in the current process.
+    Afterwards, cache entries for sessions that no longer exist are
+    pruned.
+
+    Args:
+        paths: Session JSONL files to check.
+        workers: Number of worker processes (default: CPU count).
+
+    Returns:
+        One bool per path, in input order, as returned by
+        check_and_fix_session.
+    """
+    paths = list(paths)
+    results = [False] * len(paths)
+
+    # (index, path, resolved path) of sessions not known to be healthy
+    todo = []
+    for i, path in enumerate(paths):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        resolved = str(path.resolve())
+        if _cached_healthy_key(resolved) != _stat_key(st):
+            todo.append((i, path, resolved))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    todo_paths = [path for _, path, _ in todo]
+    if workers <= 1 or len(todo_paths) <= 1:
+        outcomes = [_check_and_fix_uncached(p) for p in todo_paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(
+                executor.map(
+                    _check_and_fix_uncached, todo_paths, chunksize=8
+                )
+            )
+
+    for (i, _, resolved), (needed_fix, healthy_key) in zip(todo, outcomes):
+        results[i] = needed_fix
+        if healthy_key is not None:
+            _write_fix_cache_entry(resolved, healthy_key)
+    _prune_fix_cache()
+    return results
 
 
 def main() -> None:
     """CLI entry point for fix-session."""
+    # CLI-only imports, kept out of library use
+    import argparse
+
+    from claude_code_tools.session_utils import resolve_session_path
+
     parser = argparse.ArgumentParser(
         description=(
             "Fix orphan parentUuid references in "
@@ -341,15 +823,32 @@ def main() -> None:
             "  # Fix in place\n"
             "  fix-session f8ddc --fix -o out.jsonl"
             "  # Fix to new file\n"
+            "  fix-session --batch DIR --fix  "
+            "  # Fix all sessions in DIR\n"
         ),
     )
     parser.add_argument(
         "session",
+        nargs="?",
         help=(
             "Session identifier: partial ID, full UUID, "
             "or path to .jsonl file"
         ),
     )
+    parser.add_argument(
+        "--batch",
+        metavar="DIR",
+        help=(
+            "Check and fix every *.jsonl file in DIR in place, "
+            "creating .bak backups (requires --fix)"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --batch (default: CPU count)",
+    )
     parser.add_argument(
         "--fix",
         action="store_true",
@@ -391,6 +890,39 @@ def main() -> None:
         )
         sys.exit(1)
 
+    if args.workers is not None and not args.batch:
+        print("Error: --workers requires --batch", file=sys.stderr)
+        sys.exit(1)
+
+    if args.batch:
+        if args.session or args.output or args.in_place:
+            print(
+                "Error: --batch cannot be combined with a session, "
+                "--output or --in-place",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        if not args.fix:
+            print("Error: --batch requires --fix", file=sys.stderr)
+            sys.exit(1)
+        batch_dir = Path(args.batch).expanduser()
+        if not batch_dir.is_dir():
+            print(
+                f"Error: Not a directory: {batch_dir}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        paths = sorted(batch_dir.glob("*.jsonl"))
+        results = check_and_fix_sessions(paths, workers=args.workers)
+        print(
+            f"fix-session: Fixed {sum(results)} of "
+            f"{len(paths)} session(s) in {batch_dir}"
+        )
+        return
+
+    if not args.session:
+        parser.error("a session identifier or --batch DIR is required")
+
     # Resolve session path (supports partial IDs)
     try:
         session_path = resolve_session_path(args.session)
@@ -422,7 +954,7 @@ def main() -> None:
     print(f"\nApplied {fixes_made} fixes")
 
     # Verify fix
-    verify = analyze_session(fixed)
+    verify = verify_fix(analysis, fixed, _fixed_indices(analysis))
     print(f"\nVerification:")
     print(
         f"  Orphans remaining: "
@@ -444,9 +976,9 @@ def main() -> None:
     # Write output
     if args.in_place:
         backup = str(session_path) + ".bak"
-        shutil.copy2(session_path, backup)
+        _backup_session(session_path, backup)
         print(f"\nBackup created: {backup}")
-        write_session(fixed, session_path)
+        _replace_session(fixed, session_path)
         print(f"Fixed in place: {session_path}")
     elif args.output:
         write_session(fixed, args.output)
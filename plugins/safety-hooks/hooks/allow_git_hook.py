@@ -14,11 +14,24 @@ Creates session-scoped flag files so the PreToolUse hooks
 "ask" prompt. Dangerous operations (git add -A, git add .,
 git checkout --force) remain always blocked.
 """
-import json
 import os
 import sys
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 TRIGGER = ">allow-git"
+_TRIGGER_LEN = len(TRIGGER)
 FLAG_DIR = "/tmp/claude"
 FLAG_NAMES = ("staging", "commit")
 
@@ -29,8 +42,31 @@ YELLOW = "\033[93m"
 RESET = "\033[0m"
 
 
+FLAG_PREFIX = "allow-git-"
+
+
 def _flag_path(name: str, session_id: str) -> str:
-    return os.path.join(FLAG_DIR, f"allow-git-{name}.{session_id}")
+    return f"{FLAG_DIR}/{FLAG_PREFIX}{name}.{session_id}"
+
+
+def _scan_flags(session_id: str) -> dict[str, str]:
+    """Map flag name -> path for this session's existing flag files.
+
+    Lists FLAG_DIR once instead of stat-ing each candidate path.
+    """
+    suffix = f".{session_id}"
+    found = {}
+    try:
+        with os.scandir(FLAG_DIR) as it:
+            for entry in it:
+                fname = entry.name
+                if fname.startswith(FLAG_PREFIX) and fname.endswith(suffix):
+                    name = fname[len(FLAG_PREFIX):-len(suffix)]
+                    if name in FLAG_NAMES:
+                        found[name] = entry.path
+    except FileNotFoundError:
+        pass
+    return found
 
 
 def _set_flags(
@@ -39,9 +75,17 @@ def _set_flags(
 ) -> str:
     """Create session-scoped flag files. Returns status message."""
     os.makedirs(FLAG_DIR, exist_ok=True)
+    data = session_id.encode("utf-8")
     for name in names:
-        with open(_flag_path(name, session_id), "w", encoding="utf-8") as f:
-            f.write(session_id)
+        fd = os.open(
+            _flag_path(name, session_id),
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+            0o600,
+        )
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
 
     label = " and ".join(names)
     return (
@@ -52,20 +96,18 @@ def _set_flags(
 
 def _clear_flags(session_id: str) -> str:
     """Remove all session-scoped flag files."""
-    for name in FLAG_NAMES:
+    for path in _scan_flags(session_id).values():
         try:
-            os.remove(_flag_path(name, session_id))
+            os.unlink(path)
         except FileNotFoundError:
-            pass
+            pass  # Removed concurrently
     return f"{YELLOW}Git approval prompts restored.{RESET}"
 
 
 def _status(session_id: str) -> str:
     """Report which flags are active."""
-    active = []
-    for name in FLAG_NAMES:
-        if os.path.exists(_flag_path(name, session_id)):
-            active.append(name)
+    found = _scan_flags(session_id)
+    active = [name for name in FLAG_NAMES if name in found]
 
     if active:
         label = ", ".join(active)
@@ -76,30 +118,39 @@ def _status(session_id: str) -> str:
     return f"{BLUE}All git operations require approval.{RESET}"
 
 
+def _emit(obj: dict) -> None:
+    """Write a hook decision to stdout as one JSON line."""
+    sys.stdout.buffer.write(_dumps(obj) + b"\n")
+    sys.stdout.flush()
+
+
 def main():
     try:
-        data = json.load(sys.stdin)
+        data = _loads(sys.stdin.buffer.read())
         session_id = data.get("session_id", "")
         prompt = data.get("prompt")
 
-        if not isinstance(prompt, str) or not prompt.strip():
+        if not isinstance(prompt, str):
             sys.exit(0)
 
-        prompt = prompt.strip().lower()
-
-        # Must match trigger exactly or as prefix + space
-        if prompt != TRIGGER and not prompt.startswith(TRIGGER + " "):
+        # Must match trigger exactly or as prefix + space. Only the
+        # trigger-length prefix is lowercased, not the whole prompt.
+        prompt = prompt.lstrip()
+        if prompt[:_TRIGGER_LEN].lower() != TRIGGER:
+            sys.exit(0)
+        rest = prompt[_TRIGGER_LEN:]
+        if rest and not rest.startswith(" ") and not rest.isspace():
             sys.exit(0)
 
         if not session_id:
-            print(json.dumps({
+            _emit({
                 "decision": "block",
                 "reason": "No session ID available.",
-            }))
+            })
             sys.exit(0)
 
         # Parse the sub-command after ">allow-git"
-        arg = prompt[len(TRIGGER):].strip()
+        arg = rest.strip().lower()
 
         if arg == "off":
             message = _clear_flags(session_id)
@@ -113,10 +164,10 @@ def main():
             # No arg or unrecognized -> allow both
             message = _set_flags(FLAG_NAMES, session_id)
 
-        print(json.dumps({
+        _emit({
             "decision": "block",
             "reason": message,
-        }))
+        })
         sys.exit(0)
 
     except Exception:
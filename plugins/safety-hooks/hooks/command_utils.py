@@ -1,12 +1,75 @@
 """Shared utilities for bash command parsing."""
+import json
 import os
 import re
-import subprocess
+from functools import lru_cache
+
+# Shell chaining operators, captured so re.split keeps them. Multi-character
+# operators (&&, ||) must come before single-character variants ([;&|]) to
+# prevent partial matching.
+_OP_KEEP_RE = re.compile(r'(\s*(?:&&|\|\||[;&|])\s*)')
+# Byte -> 1 if it is a shell operator character (; | &), for byte scanning
+_OP_TABLE = bytes(1 if ch in b';|&' else 0 for ch in range(256))
+_ANSI_OSC_RE = re.compile(r'\x1b\][^\x07]*\x07')
+_ANSI_CSI_RE = re.compile(r'\x1b\[[0-9;]*[a-zA-Z]')
+
+# First tokens that are never alias-expanded: the commands the safety hooks
+# inspect, so an alias can't mask them
+_KNOWN_COMMANDS = frozenset({'git', 'rm', 'cat', 'less', 'nano', 'vim'})
 
 # Cache for alias expansions (populated on first use)
 _alias_cache: dict[str, str] | None = None
 
 
+def _alias_disk_cache_path() -> str:
+    """Path of the alias cache shared across hook invocations."""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(cache_home, 'claude-code-tools', 'aliases.json')
+
+
+def _read_alias_disk_cache(key: list) -> dict[str, str] | None:
+    """
+    Return aliases saved by an earlier hook run, or None if stale/missing.
+
+    The cache is only valid for the same shell and rc file at the same
+    mtime. Files sourced by the rc file are not tracked; touch the rc
+    file to force a reload after editing them.
+    """
+    try:
+        with open(_alias_disk_cache_path(), 'rb') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get('key') != key:
+        return None
+    aliases = cached.get('aliases')
+    return aliases if isinstance(aliases, dict) else None
+
+
+def _write_alias_disk_cache(key: list, aliases: dict[str, str]) -> None:
+    """Atomically save aliases for later hook runs, ignoring failures."""
+    import tempfile
+
+    path = _alias_disk_cache_path()
+    cache_dir = os.path.dirname(path)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', dir=cache_dir,
+            prefix='.aliases.', suffix='.tmp', delete=False,
+        ) as f:
+            tmp_path = f.name
+            json.dump({'key': key, 'aliases': aliases}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
 def _load_alias_cache() -> dict[str, str]:
     """
     Load all shell aliases into a cache dict.
@@ -14,6 +77,8 @@ def _load_alias_cache() -> dict[str, str]:
     Sources the shell rc file and runs 'alias' to get all aliases.
     Avoids -i (interactive) flag to prevent TTY issues when run as
     a background process by Claude Code.
+    The result is saved to disk and reused by later hook processes
+    until the rc file changes, so the shell only runs on a cache miss.
     Returns empty dict on failure.
     """
     global _alias_cache
@@ -22,14 +87,25 @@ def _load_alias_cache() -> dict[str, str]:
 
     _alias_cache = {}
     shell = os.environ.get('SHELL', '/bin/bash')
+    rc_file = '~/.zshrc' if 'zsh' in shell else '~/.bashrc'
+    try:
+        rc_mtime = os.stat(os.path.expanduser(rc_file)).st_mtime_ns
+    except OSError:
+        rc_mtime = None
+    key = [shell, rc_file, rc_mtime]
+
+    cached = _read_alias_disk_cache(key)
+    if cached is not None:
+        _alias_cache = cached
+        return _alias_cache
+
+    # Only needed on a cache miss; importing it costs more than the hook
+    import subprocess
 
     try:
         # Avoid -i (interactive) flag which can cause TTY issues
         # Source rc file explicitly to get aliases without interactive mode
-        if 'zsh' in shell:
-            cmd = [shell, '-c', 'source ~/.zshrc 2>/dev/null; alias']
-        else:
-            cmd = [shell, '-c', 'source ~/.bashrc 2>/dev/null; alias']
+        cmd = [shell, '-c', f'source {rc_file} 2>/dev/null; alias']
 
         result = subprocess.run(
             cmd,
@@ -37,42 +113,54 @@ def _load_alias_cache() -> dict[str, str]:
             text=True,
             timeout=5,
             stdin=subprocess.DEVNULL,  # Explicitly close stdin
-            start_new_session=True,  # Isolate from terminal control
-            env={**os.environ, 'PS1': '', 'TERM': 'dumb'},
+            # Isolate from terminal control. Unlike process_group=0, setsid
+            # also drops the controlling TTY, so a stray read from the rc
+            # file can't stop the shell with SIGTTIN. It doesn't prevent
+            # CPython from using vfork.
+            start_new_session=True,
+            env=os.environ | {'PS1': '', 'TERM': 'dumb'},
         )
         output = result.stdout
 
-        # Strip ANSI escape sequences
-        output = re.sub(r'\x1b\][^\x07]*\x07', '', output)
-        output = re.sub(r'\x1b\[[0-9;]*[a-zA-Z]', '', output)
+        # Strip ANSI escape sequences (rare with TERM=dumb)
+        if '\x1b' in output:
+            output = _ANSI_OSC_RE.sub('', output)
+            output = _ANSI_CSI_RE.sub('', output)
 
         # Parse alias output - handles both bash and zsh formats:
         # bash: alias gcam='git commit -am'
         # zsh:  gcam='git commit -a -m' or gcam="git commit -a -m"
-        for line in output.strip().split('\n'):
-            line = line.strip()
-            if not line:
+        for line in output.split('\n'):
+            # Parse name=value, working with indices into the raw line
+            eq = line.find('=')
+            if eq == -1:
+                continue
+            i = 0
+            while i < eq and line[i].isspace():
+                i += 1
+            # Skip leading 'alias ' if present (bash format)
+            if line.startswith('alias ', i):
+                i += 6
+            name = line[i:eq].strip()
+            if not name:
                 continue
-            # Remove leading 'alias ' if present (bash format)
-            if line.startswith('alias '):
-                line = line[6:]
-            # Parse name=value
-            if '=' in line:
-                name, _, value = line.partition('=')
-                name = name.strip()
-                value = value.strip()
-                # Remove surrounding quotes
-                if (value.startswith("'") and value.endswith("'")) or \
-                   (value.startswith('"') and value.endswith('"')):
-                    value = value[1:-1]
-                if name:
-                    _alias_cache[name] = value
+            value = line[eq + 1:].strip()
+            # Remove surrounding quotes
+            if value[:1] in ("'", '"') and value.endswith(value[0]):
+                value = value[1:-1]
+            _alias_cache[name] = value
     except Exception:
-        pass  # Fail silently, return empty cache
+        return _alias_cache  # Fail silently, don't persist a failed load
 
+    _write_alias_disk_cache(key, _alias_cache)
     return _alias_cache
 
 
+def _may_be_alias(first_token: str) -> bool:
+    """Whether a first token is eligible for alias expansion at all."""
+    return '/' not in first_token and first_token not in _KNOWN_COMMANDS
+
+
 def expand_alias(command: str) -> str:
     """
     Expand shell alias in the first token of a command.
@@ -100,7 +188,7 @@ def expand_alias(command: str) -> str:
     rest = parts[1] if len(parts) > 1 else ""
 
     # Skip if already a known command or path
-    if first_token in ('git', 'rm', 'cat', 'less', 'nano', 'vim') or '/' in first_token:
+    if not _may_be_alias(first_token):
         return command
 
     # Look up in alias cache
@@ -140,16 +228,21 @@ def expand_command_aliases(command: str) -> str:
     if not command:
         return command
 
+    # Nothing could be an alias: skip the rebuild and the alias load
+    if not any(
+        _may_be_alias(sub.split(None, 1)[0])
+        for sub in extract_subcommands(command)
+    ):
+        return command
+
     # Find the operators and their positions to preserve them.
     # This regex captures the operators as well as the commands.
-    # Multi-character operators (&&, ||) must come before single-character
-    # variants ([;&|]) to prevent partial matching.
-    parts = re.split(r'(\s*(?:&&|\|\||[;&|])\s*)', command)
+    parts = _OP_KEEP_RE.split(command)
 
     result = []
-    for part in parts:
-        # Check if this part is an operator
-        if re.match(r'\s*(?:&&|\|\||[;&|])\s*', part):
+    for idx, part in enumerate(parts):
+        # re.split puts captured operators at odd indices
+        if idx % 2 == 1:
             result.append(part)
         elif part.strip():
             # It's a command, expand its alias
@@ -190,11 +283,64 @@ def extract_subcommands(command: str) -> list[str]:
     """
     if not command:
         return []
-    subcommands = re.split(r'\s*(?:&&|\|\||[;&|])\s*', command)
-    return [cmd.strip() for cmd in subcommands if cmd.strip()]
+    return list(_split_subcommands(command))
+
+
+@lru_cache(maxsize=1024)
+def _split_subcommands(command: str) -> tuple[str, ...]:
+    """Memoized operator split behind extract_subcommands()."""
+    # Scan the UTF-8 bytes: operators are ASCII, so slicing at them never
+    # splits a multi-byte character.
+    data = command.encode('utf-8', 'surrogatepass')
+    n = len(data)
+    subcommands = []
+    start = 0
+    i = 0
+    while i < n:
+        c = data[i]
+        if _OP_TABLE[c]:
+            cmd = data[start:i].decode('utf-8', 'surrogatepass').strip()
+            if cmd:
+                subcommands.append(cmd)
+            if c != 0x3B and i + 1 < n and data[i + 1] == c:
+                i += 1  # && or ||
+            start = i + 1
+        i += 1
+    cmd = data[start:].decode('utf-8', 'surrogatepass').strip()
+    if cmd:
+        subcommands.append(cmd)
+    return tuple(subcommands)
 
 
-def _extract_balanced_paren_content(command: str, start_idx: int) -> str | None:
+def _find_matching_paren(command: str, start_idx: int, end_idx: int) -> int:
+    """
+    Find the ')' matching the '(' at start_idx, scanning no further than end_idx.
+
+    Returns:
+        Index of the matching closing paren, or -1 if there is none.
+    """
+    # Jump between parens with str.find rather than stepping through every
+    # character. The next ')' is remembered, so each stretch is searched once.
+    depth = 1
+    i = start_idx + 1
+    close_idx = command.find(')', i, end_idx)
+    while close_idx != -1:
+        open_idx = command.find('(', i, close_idx)
+        if open_idx != -1:
+            depth += 1
+            i = open_idx + 1
+            continue
+        depth -= 1
+        if depth == 0:
+            return close_idx
+        i = close_idx + 1
+        close_idx = command.find(')', i, end_idx)
+    return -1
+
+
+def _extract_balanced_paren_content(
+    command: str, start_idx: int
+) -> tuple[str | None, int]:
     """
     Extract content from balanced parentheses starting at given index.
 
@@ -206,28 +352,21 @@ def _extract_balanced_paren_content(command: str, start_idx: int) -> str | None:
         start_idx: Index of the opening '(' character.
 
     Returns:
-        The content between the balanced parentheses (excluding the parens
-        themselves), or None if no balanced closing paren is found.
+        Tuple of (content, close_idx): the content between the balanced
+        parentheses (excluding the parens themselves) and the index of the
+        closing ')'. Returns (None, -1) if no balanced closing paren is found.
 
     Example:
         >>> _extract_balanced_paren_content("$(echo $(rm foo))", 1)
-        'echo $(rm foo)'
+        ('echo $(rm foo)', 16)
     """
     if start_idx >= len(command) or command[start_idx] != '(':
-        return None
-
-    depth = 0
-    for i in range(start_idx, len(command)):
-        if command[i] == '(':
-            depth += 1
-        elif command[i] == ')':
-            depth -= 1
-            if depth == 0:
-                # Found the matching closing paren
-                return command[start_idx + 1:i]
+        return None, -1
 
-    # No matching closing paren found
-    return None
+    close_idx = _find_matching_paren(command, start_idx, len(command))
+    if close_idx == -1:
+        return None, -1
+    return command[start_idx + 1:close_idx], close_idx
 
 
 def extract_subshell_commands(command: str) -> list[str]:
@@ -263,35 +402,96 @@ def extract_subshell_commands(command: str) -> list[str]:
     """
     if not command:
         return []
+    return list(_subshell_commands(command))
 
+
+@lru_cache(maxsize=1024)
+def _subshell_commands(command: str) -> tuple[str, ...]:
+    """Memoized subshell scan behind extract_subshell_commands()."""
     subshell_commands = []
 
     # Extract from $(...) - modern command substitution
     # Use balanced parenthesis scanning to handle nested subshells
-    i = 0
-    while i < len(command) - 1:
-        if command[i:i+2] == '$(':
-            # Found start of $(), extract balanced content
-            inner_cmd = _extract_balanced_paren_content(command, i + 1)
-            if inner_cmd is not None:
-                inner_cmd = inner_cmd.strip()
-                if inner_cmd:
-                    subshell_commands.append(inner_cmd)
-                # Skip past this subshell to avoid re-matching nested ones
-                # at the top level (they'll be found via recursion)
-                i += 2 + len(inner_cmd) + 1  # $( + content + )
-                continue
-        i += 1
-
-    # Extract from `...` - backtick command substitution (legacy syntax)
-    # Backticks cannot be nested, so a simple pattern works
-    backtick_pattern = r'`([^`]+)`'
-    for match in re.finditer(backtick_pattern, command):
-        inner_cmd = match.group(1).strip()
+    i = command.find('$(')
+    while i != -1:
+        # Found start of $(), extract balanced content
+        inner_cmd, close_idx = _extract_balanced_paren_content(command, i + 1)
+        if inner_cmd is None:
+            i = command.find('$(', i + 1)
+            continue
+        inner_cmd = inner_cmd.strip()
         if inner_cmd:
             subshell_commands.append(inner_cmd)
+        # Skip past this subshell to avoid re-matching nested ones
+        # at the top level (they'll be found via recursion)
+        i = command.find('$(', close_idx + 1)
+
+    # Extract from `...` - backtick command substitution (legacy syntax)
+    # Backticks cannot be nested, so after splitting on them every odd
+    # fragment is the body of a substitution (`` pairs up like bash does)
+    if '`' in command:
+        parts = command.split('`')
+        for j in range(1, len(parts) - 1, 2):
+            inner_cmd = parts[j].strip()
+            if inner_cmd:
+                subshell_commands.append(inner_cmd)
+
+    return tuple(subshell_commands)
 
-    return subshell_commands
+
+def _extract_into(command: str, out: list[str]) -> None:
+    """
+    Append every command in a bash command string, including subshells.
+
+    Each span is walked once: shell operators split it into commands, and
+    the bodies of $(...) and `...` found along the way are pushed onto a
+    work stack as (start, end) spans of the original string instead of
+    being copied and re-parsed recursively. Spans are processed depth-first
+    with $() bodies before backtick bodies, so commands come out in the same
+    order as splitting a span and then recursing into its subshells.
+
+    Operators split everywhere, including inside subshells and quotes, as
+    extract_subcommands() does. Splitting only at depth 0 would hide an rm
+    inside a plain (...) group or behind an unbalanced '$(' in a string.
+    """
+    append = out.append
+    stack = [(0, len(command))]
+    while stack:
+        start, end = stack.pop()
+        dollar_bodies = []
+        backtick_bodies = []
+        seg_start = start
+        dollar_from = start  # Nested $() are found when their parent is lexed
+        backtick_from = start
+        i = start
+        while i < end:
+            c = command[i]
+            if c == ';' or c == '|' or c == '&':
+                seg = command[seg_start:i].strip()
+                if seg:
+                    append(seg)
+                # && and || are single operators; ;; is two empty commands
+                if c != ';' and i + 1 < end and command[i + 1] == c:
+                    i += 1
+                seg_start = i + 1
+            elif c == '$':
+                if i >= dollar_from and i + 1 < end and command[i + 1] == '(':
+                    close_idx = _find_matching_paren(command, i + 1, end)
+                    if close_idx != -1:
+                        dollar_bodies.append((i + 2, close_idx))
+                        dollar_from = close_idx + 1
+            elif c == '`' and i >= backtick_from:
+                close_idx = command.find('`', i + 1, end)
+                if close_idx == -1:
+                    backtick_from = end
+                else:
+                    backtick_bodies.append((i + 1, close_idx))
+                    backtick_from = close_idx + 1
+            i += 1
+        seg = command[seg_start:end].strip()
+        if seg:
+            append(seg)
+        stack.extend(reversed(dollar_bodies + backtick_bodies))
 
 
 def extract_all_commands(command: str) -> list[str]:
@@ -319,19 +519,12 @@ def extract_all_commands(command: str) -> list[str]:
     """
     if not command:
         return []
+    return list(_all_commands(command))
 
-    all_commands = []
-
-    # First, extract top-level subcommands (split on operators)
-    subcommands = extract_subcommands(command)
-    all_commands.extend(subcommands)
-
-    # Then, extract commands from subshells within the original command
-    subshell_cmds = extract_subshell_commands(command)
-
-    # Recursively process subshell commands (they may contain nested subshells
-    # or chained operators)
-    for subcmd in subshell_cmds:
-        all_commands.extend(extract_all_commands(subcmd))
 
-    return all_commands
+@lru_cache(maxsize=1024)
+def _all_commands(command: str) -> tuple[str, ...]:
+    """Memoized _extract_into() result behind extract_all_commands()."""
+    out = []
+    _extract_into(command, out)
+    return tuple(out)
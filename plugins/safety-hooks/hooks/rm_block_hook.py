@@ -10,16 +10,18 @@ execute 'rm', including:
 
 Instead of deletion, users are guided to move files to a TRASH directory.
 """
-import re
 import sys
 import os
+from functools import lru_cache
 
 # Add the hooks directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from command_utils import extract_all_commands
+# Pre-encoded response for the common path: no JSON encoding needed
+_APPROVE_JSON = b'{"decision": "approve"}\n'
 
 
+@lru_cache(maxsize=1024)
 def _is_rm_command(single_cmd: str) -> bool:
     """
     Check if a single command (not compound) is an rm invocation.
@@ -35,17 +37,46 @@ def _is_rm_command(single_cmd: str) -> bool:
     Returns:
         True if this command would invoke rm, False otherwise.
     """
-    normalized = ' '.join(single_cmd.strip().split())
-    if not normalized:
+    parts = single_cmd.split(None, 1)
+    if not parts:
         return False
 
     # Check for rm at the start of command (with or without path prefix)
     # Matches: rm, rm -rf, /bin/rm, /usr/bin/rm foo, etc.
-    return bool(
-        normalized == "rm" or
-        normalized.startswith("rm ") or
-        re.match(r'^/\S*/rm\b', normalized)
-    )
+    head = parts[0]
+    if head == "rm":
+        return True
+    if not head.startswith('/'):
+        return False
+    # Absolute path with an 'rm' component not followed by a word character
+    i = head.find('/rm', 1)
+    while i != -1:
+        after = head[i + 3:i + 4]
+        if not (after.isalnum() or after == '_'):
+            return True
+        i = head.find('/rm', i + 1)
+    return False
+
+
+def _has_rm_candidate(command: str) -> bool:
+    """
+    Cheap pre-filter: does 'rm' appear as a standalone word anywhere?
+
+    Any command _is_rm_command() would flag has 'rm' with no word
+    character on either side (after whitespace, an operator, '(', '`' or
+    '/', and before whitespace, an operator or the end). This is the
+    same test as the regex \\brm\\b, so it never rejects a real rm; it only
+    lets commands without one skip parsing entirely.
+    """
+    i = command.find('rm')
+    while i != -1:
+        before = command[i - 1] if i else ' '
+        after = command[i + 2] if i + 2 < len(command) else ' '
+        if not (before.isalnum() or before == '_') and \
+           not (after.isalnum() or after == '_'):
+            return True
+        i = command.find('rm', i + 1)
+    return False
 
 
 def check_rm_command(command: str) -> tuple[bool, str | None]:
@@ -63,6 +94,13 @@ def check_rm_command(command: str) -> tuple[bool, str | None]:
         Tuple of (should_block, reason). If should_block is True, reason
         contains guidance for the user on the preferred approach.
     """
+    # Most commands never mention rm; skip parsing them
+    if not _has_rm_candidate(command):
+        return False, None
+
+    # Deferred so non-Bash tool calls never pay for the parser import
+    from command_utils import extract_all_commands
+
     # Extract all commands including subshells and chained commands
     all_commands = extract_all_commands(command)
 
@@ -92,7 +130,7 @@ if __name__ == "__main__":
     # Only intercept Bash tool calls
     tool_name = data.get("tool_name")
     if tool_name != "Bash":
-        print(json.dumps({"decision": "approve"}))
+        sys.stdout.buffer.write(_APPROVE_JSON)
         sys.exit(0)
 
     # Get the command being executed
@@ -101,11 +139,11 @@ if __name__ == "__main__":
     should_block, reason = check_rm_command(command)
 
     if should_block:
-        print(json.dumps({
+        sys.stdout.buffer.write(json.dumps({
             "decision": "block",
             "reason": reason
-        }, ensure_ascii=False))
+        }, ensure_ascii=False).encode("utf-8") + b"\n")
     else:
-        print(json.dumps({"decision": "approve"}))
+        sys.stdout.buffer.write(_APPROVE_JSON)
 
     sys.exit(0)
@@ -11,6 +11,7 @@ Tests cover:
 import unittest
 import sys
 import os
+import tempfile
 
 # Add the hooks directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -22,6 +23,25 @@ from command_utils import (
     expand_command_aliases,
 )
 
+_cache_home = None
+_saved_cache_home = None
+
+
+def setUpModule():
+    """Keep the persisted alias cache out of the real home directory."""
+    global _cache_home, _saved_cache_home
+    _cache_home = tempfile.TemporaryDirectory()
+    _saved_cache_home = os.environ.get("XDG_CACHE_HOME")
+    os.environ["XDG_CACHE_HOME"] = _cache_home.name
+
+
+def tearDownModule():
+    if _saved_cache_home is None:
+        os.environ.pop("XDG_CACHE_HOME", None)
+    else:
+        os.environ["XDG_CACHE_HOME"] = _saved_cache_home
+    _cache_home.cleanup()
+
 
 class TestExtractSubcommands(unittest.TestCase):
     """Tests for extract_subcommands() shell operator splitting."""
@@ -104,6 +124,12 @@ class TestExtractSubshellCommands(unittest.TestCase):
         result = extract_subshell_commands("echo `whoami`")
         self.assertEqual(result, ["whoami"])
 
+    def test_backticks_pair_in_order(self):
+        """Empty `` pairs like bash does; an unclosed backtick is ignored."""
+        self.assertEqual(extract_subshell_commands("x``y`rm z`"), ["rm z"])
+        self.assertEqual(extract_subshell_commands("a `b` `c"), ["b"])
+        self.assertIn("rm z", extract_all_commands("x``y`rm z`"))
+
     def test_multiple_subshells(self):
         """Multiple subshells in one command."""
         result = extract_subshell_commands("$(cmd1) foo $(cmd2)")
@@ -200,6 +226,29 @@ class TestExtractAllCommands(unittest.TestCase):
         result = extract_all_commands("echo $(rm secret)")
         self.assertIn("rm secret", result)
 
+    def test_nested_subshells_depth_first(self):
+        """Top-level commands come first, then each subshell depth-first."""
+        result = extract_all_commands("$(a $(b)) && `c`")
+        self.assertEqual(result, ["$(a $(b))", "`c`", "a $(b)", "b", "c"])
+
+    def test_deep_nesting_does_not_recurse(self):
+        """Nesting deeper than the recursion limit is still fully extracted."""
+        depth = sys.getrecursionlimit() + 100
+        command = "$(" * depth + "rm foo" + ")" * depth
+        result = extract_all_commands(command)
+        self.assertEqual(len(result), depth + 1)
+        self.assertEqual(result[-1], "rm foo")
+
+    def test_security_grouped_commands_split(self):
+        """Operators inside a plain ( ) group still split - security."""
+        result = extract_all_commands("(cd /tmp; rm foo)")
+        self.assertIn("rm foo)", result)
+
+    def test_security_unbalanced_subshell_in_quotes(self):
+        """An unclosed '$(' does not swallow later commands - security."""
+        result = extract_all_commands("echo '$(' ; rm foo")
+        self.assertIn("rm foo", result)
+
 
 class TestExpandCommandAliases(unittest.TestCase):
     """Tests for expand_command_aliases() with updated operator support."""
@@ -236,4 +285,13 @@ class TestExpandCommandAliases(unittest.TestCase):
 
 
 if __name__ == "__main__":
-    unittest.main()
+    # The cases are independent, so run them in parallel when available
+    try:
+        from unittest_parallel.main import main as parallel_main
+    except ImportError:
+        unittest.main()
+    else:
+        parallel_main([
+            "-s", os.path.dirname(os.path.abspath(__file__)),
+            "-p", os.path.basename(__file__),
+        ])
@@ -10,14 +10,35 @@ Tests cover:
     - Safe commands that should pass through
 """
 import unittest
+from unittest import mock
 import sys
 import os
 
 # Add the hooks directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from rm_block_hook import check_rm_command, _is_rm_command
-
+from rm_block_hook import check_rm_command, _has_rm_candidate, _is_rm_command
+
+
+# (category, command) pairs that must all be blocked
+BYPASS_CASES = [
+    ("pipe", "echo ok | rm foo"),
+    ("pipe", "cat file | rm -rf /tmp"),
+    ("background", "sleep 1 & rm foo"),
+    ("background", "cmd & /bin/rm bar"),
+    ("and", "cd /tmp && rm foo"),
+    ("or", "test -f x || rm y"),
+    ("semicolon", "echo done; rm foo"),
+    ("dollar_paren", "echo $(rm foo)"),
+    ("dollar_paren", "$(rm -rf /)"),
+    ("backtick", "echo `rm foo`"),
+    ("backtick", "cat `rm bar`"),
+    ("pipe_chain", "echo safe | cat | rm evil"),
+    ("subshell_and", "echo $(rm foo) && ls"),
+    ("subshell_background", "$(rm x) & echo done"),
+    ("nested", "echo $(echo $(rm foo))"),
+    ("nested", "$(cat $(ls $(rm secret)))"),
+]
 
 class TestIsRmCommand(unittest.TestCase):
     """Tests for _is_rm_command() single command detection."""
@@ -80,24 +101,19 @@ class TestCheckRmCommand(unittest.TestCase):
         blocked, _ = check_rm_command("echo hello")
         self.assertFalse(blocked)
 
-    # Security bypass tests - these are the key regression tests
+    # Security bypass tests - these are the key regression tests.
+    # One representative per category below; BYPASS_CASES covers the rest.
 
     def test_pipe_bypass_blocked(self):
         """rm after pipe operator is blocked - security regression test."""
         blocked, _ = check_rm_command("echo ok | rm foo")
         self.assertTrue(blocked, "rm after pipe should be blocked")
 
-        blocked, _ = check_rm_command("cat file | rm -rf /tmp")
-        self.assertTrue(blocked, "rm in pipe chain should be blocked")
-
     def test_background_bypass_blocked(self):
         """rm after background operator is blocked - security regression test."""
         blocked, _ = check_rm_command("sleep 1 & rm foo")
         self.assertTrue(blocked, "rm after background operator should be blocked")
 
-        blocked, _ = check_rm_command("cmd & /bin/rm bar")
-        self.assertTrue(blocked, "rm with path after & should be blocked")
-
     def test_and_operator_blocked(self):
         """rm after && operator is blocked."""
         blocked, _ = check_rm_command("cd /tmp && rm foo")
@@ -118,40 +134,35 @@ class TestCheckRmCommand(unittest.TestCase):
         blocked, _ = check_rm_command("echo $(rm foo)")
         self.assertTrue(blocked, "rm in $() subshell should be blocked")
 
-        blocked, _ = check_rm_command("$(rm -rf /)")
-        self.assertTrue(blocked, "bare $() with rm should be blocked")
-
     def test_subshell_backtick_blocked(self):
         """rm inside backtick subshell is blocked - security regression test."""
         blocked, _ = check_rm_command("echo `rm foo`")
         self.assertTrue(blocked, "rm in backticks should be blocked")
 
-        blocked, _ = check_rm_command("cat `rm bar`")
-        self.assertTrue(blocked, "rm in backticks should be blocked")
-
-    def test_complex_bypass_attempts(self):
-        """Complex commands attempting to hide rm are blocked."""
-        # Multiple levels of indirection
-        blocked, _ = check_rm_command("echo safe | cat | rm evil")
-        self.assertTrue(blocked, "rm at end of pipe chain should be blocked")
-
-        # Subshell inside chained command
-        blocked, _ = check_rm_command("echo $(rm foo) && ls")
-        self.assertTrue(blocked, "rm in subshell with && should be blocked")
-
-        # Background with subshell
-        blocked, _ = check_rm_command("$(rm x) & echo done")
-        self.assertTrue(blocked, "rm in subshell with & should be blocked")
-
     def test_nested_subshell_bypass_blocked(self):
         """rm hidden in nested $() subshells is blocked - P1 security fix."""
         # This was a bypass: the regex stopped at first ), missing inner rm
         blocked, _ = check_rm_command("echo $(echo $(rm foo))")
         self.assertTrue(blocked, "rm in nested subshell should be blocked")
 
-        # Deeper nesting
-        blocked, _ = check_rm_command("$(cat $(ls $(rm secret)))")
-        self.assertTrue(blocked, "rm in deeply nested subshell should be blocked")
+    def test_bypasses(self):
+        """Every known way of hiding rm is blocked."""
+        for name, cmd in BYPASS_CASES:
+            with self.subTest(name=name, cmd=cmd):
+                blocked, _ = check_rm_command(cmd)
+                self.assertTrue(blocked)
+
+    def test_quotes_do_not_hide_operators(self):
+        """Splitting ignores quoting, so a stray quote cannot mask rm."""
+        for cmd in (
+            "echo \\'; rm x",
+            "echo \"a; rm x\"",
+            "echo 'a' ; rm x",
+            "echo \"$(rm x)\"",
+        ):
+            with self.subTest(cmd=cmd):
+                blocked, _ = check_rm_command(cmd)
+                self.assertTrue(blocked)
 
     def test_reason_message_content(self):
         """Blocked commands include helpful guidance in reason."""
@@ -186,6 +197,34 @@ class TestEdgeCases(unittest.TestCase):
         blocked, _ = check_rm_command("rmdir empty_dir")
         self.assertFalse(blocked, "rmdir should not be blocked")
 
+    def test_rm_as_word_reaches_full_check(self):
+        """Pre-filter passes rm glued to operators and paths through."""
+        for cmd in ("ls;rm x", "echo `rm x`", "x &&rm y", "/bin/rm\tx"):
+            blocked, _ = check_rm_command(cmd)
+            self.assertTrue(blocked, f"Should block: {cmd}")
+
+    def test_rm_inside_words_skips_parsing(self):
+        """Commands with 'rm' only inside words are rejected early."""
+        self.assertFalse(_has_rm_candidate("npm run format && chmod +x f"))
+        self.assertTrue(_has_rm_candidate("echo ok | rm foo"))
+
+    def test_long_safe_command_never_parsed(self):
+        """A long command without 'rm' returns before any parsing."""
+        with mock.patch(
+            "command_utils.extract_all_commands",
+            side_effect=AssertionError("should not parse"),
+        ):
+            self.assertEqual(check_rm_command("echo foo" * 1000), (False, None))
+
 
 if __name__ == "__main__":
-    unittest.main()
+    # The cases are independent, so run them in parallel when available
+    try:
+        from unittest_parallel.main import main as parallel_main
+    except ImportError:
+        unittest.main()
+    else:
+        parallel_main([
+            "-s", os.path.dirname(os.path.abspath(__file__)),
+            "-p", os.path.basename(__file__),
+        ])
@@ -8,6 +8,7 @@ the need for a headless Claude call to generate summaries.
 """
 
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -20,13 +21,38 @@ from voice_common import (
     clear_just_disabled_flag,
 )
 
+# Fixed responses, serialized once at import
+_APPROVE_JSON = json.dumps({"decision": "approve"}).encode() + b"\n"
+_DISABLED_JSON = json.dumps({
+    "hookSpecificOutput": {
+        "hookEventName": "UserPromptSubmit",
+        "additionalContext": (
+            "Voice feedback has been DISABLED. "
+            "Do NOT add 📢 spoken summaries to your responses."
+        )
+    }
+}).encode() + b"\n"
+
+
+def _reminder_payload(custom_prompt: str) -> bytes:
+    """Serialized hook output injecting the voice reminder."""
+    # Use additionalContext for truly silent injection (Claude sees it, user doesn't)
+    return json.dumps({
+        "hookSpecificOutput": {
+            "hookEventName": "UserPromptSubmit",
+            "additionalContext": build_full_reminder(custom_prompt)
+        }
+    }).encode() + b"\n"
+
 
 def main():
     try:
-        # Consume stdin (hook input), but we don't need the data
-        json.load(sys.stdin)
-    except json.JSONDecodeError:
-        print(json.dumps({"decision": "approve"}))
+        # Drain stdin so the caller never blocks on the pipe; the payload
+        # itself isn't needed, so skip parsing it
+        while os.read(0, 65536):
+            pass
+    except OSError:
+        sys.stdout.buffer.write(_APPROVE_JSON)
         return
 
     # Check if voice is enabled and if it was just disabled
@@ -35,31 +61,15 @@ def main():
     # If just disabled, inject a "don't add summaries" message and clear the flag
     if just_disabled:
         clear_just_disabled_flag()
-        print(json.dumps({
-            "hookSpecificOutput": {
-                "hookEventName": "UserPromptSubmit",
-                "additionalContext": (
-                    "Voice feedback has been DISABLED. "
-                    "Do NOT add 📢 spoken summaries to your responses."
-                )
-            }
-        }))
+        sys.stdout.buffer.write(_DISABLED_JSON)
         return
 
     if not enabled:
-        print(json.dumps({"decision": "approve"}))
+        sys.stdout.buffer.write(_APPROVE_JSON)
         return
 
     # Build the full reminder with custom prompt if any
-    reminder = build_full_reminder(custom_prompt)
-
-    # Use additionalContext for truly silent injection (Claude sees it, user doesn't)
-    print(json.dumps({
-        "hookSpecificOutput": {
-            "hookEventName": "UserPromptSubmit",
-            "additionalContext": reminder
-        }
-    }))
+    sys.stdout.buffer.write(_reminder_payload(custom_prompt))
 
 
 if __name__ == "__main__":
@@ -13,12 +13,13 @@ Simulates real-world voice summary scenario:
 """
 
 import argparse
-import io
-import subprocess
+import queue
+import struct
 import sys
-import tempfile
 import time
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from urllib.parse import urlencode
 
 import numpy as np
 
@@ -31,28 +32,62 @@ TEST_SENTENCES = [
     "Updated the voice plugin with smarter summary extraction and silent hooks.",
 ]
 
+# KittenTTS outputs mono float audio at 24kHz
+_INV_KITTEN_SR = 1.0 / 24000.0
 
-def check_dependencies():
-    """Check if required dependencies are available."""
+# WAV format tags whose data size maps directly to duration:
+# PCM, IEEE float and WAVE_FORMAT_EXTENSIBLE
+_UNCOMPRESSED_WAV_FORMATS = (1, 3, 0xFFFE)
+
+# pocket-tts /tts takes the text as a form field, not JSON
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# In-flight requests for pocket-tts with --concurrent (pooled keep-alive
+# connections)
+POCKET_WORKERS = 4
+
+
+@cache
+def _kitten():
+    """Import KittenTTS on first use; this initializes ONNX Runtime."""
+    from kittentts import KittenTTS
+    return KittenTTS
+
+
+@cache
+def _requests():
+    """Import requests on first use (only pocket-tts needs it)."""
+    import requests
+    return requests
+
+
+def check_dependencies(kitten: bool = True, pocket: bool = True):
+    """Check if the selected backends' dependencies are available.
+
+    Only the chosen backends are imported, so a --pocket-only run never
+    pays for ONNX Runtime start-up.
+    """
     missing = []
 
-    # Check for soundfile (needed for audio playback timing)
-    try:
-        import soundfile
-    except ImportError:
-        missing.append("soundfile")
+    if kitten:
+        # Check for soundfile (needed for audio playback timing)
+        try:
+            import soundfile
+        except ImportError:
+            missing.append("soundfile")
 
-    # Check for kittentts
-    try:
-        from kittentts import KittenTTS
-    except ImportError:
-        missing.append("kittentts")
+        # Check for kittentts
+        try:
+            _kitten()
+        except ImportError:
+            missing.append("kittentts")
 
     # Check for requests (for pocket-tts)
-    try:
-        import requests
-    except ImportError:
-        missing.append("requests")
+    if pocket:
+        try:
+            _requests()
+        except ImportError:
+            missing.append("requests")
 
     if missing:
         print(f"Missing dependencies: {', '.join(missing)}")
@@ -67,13 +102,59 @@ def check_dependencies():
     return True
 
 
-def benchmark_kittentts(sentences: list[str], iterations: int = 3) -> dict:
-    """Benchmark KittenTTS generation times."""
-    from kittentts import KittenTTS
-    import soundfile as sf
+# Marks a row with no timing in the int64 nanosecond arrays
+_NO_TIME = -1
+
+
+def _timing_arrays(total: int) -> dict:
+    """Preallocated per-generation result arrays.
+
+    Generation times are int64 nanoseconds; failed rows stay _NO_TIME in
+    those and NaN in the float arrays.
+    """
+    return {
+        "generation_ns": np.full(total, _NO_TIME, dtype=np.int64),
+        "audio_durations": np.full(total, np.nan),
+        "chars_per_second": np.full(total, np.nan),
+    }
+
+
+def _finite(values: np.ndarray) -> np.ndarray:
+    """Drop the NaN rows left by failed generations."""
+    return values[np.isfinite(values)]
+
+
+def _seconds(ns: np.ndarray) -> np.ndarray:
+    """Convert recorded nanosecond timings to seconds, dropping empty rows."""
+    return ns[ns != _NO_TIME].astype(np.float64) * 1e-9
+
+
+def _timed_generate(model, sentence: str):
+    """Generate one sentence with KittenTTS, returning (elapsed_ns, audio)."""
+    gen_start = time.perf_counter_ns()
+    audio = model.generate(sentence, voice="expr-voice-2-f")
+    return time.perf_counter_ns() - gen_start, audio
+
+
+def benchmark_kittentts(sentences: list[str], iterations: int = 3,
+                        warmup: int = 1, workers: int = 1) -> dict:
+    """Benchmark KittenTTS generation times.
+
+    The first warmup generations are run untimed, so ONNX Runtime session
+    setup and allocator growth don't land in the first measured sample.
+    With workers > 1, generations run on a thread pool and each worker
+    thread uses its own model instance: generate() runs the phonemizer
+    (espeak) before ONNX inference, and that preprocessing is not known
+    to be thread-safe, so no instance is ever used by two threads at
+    once. Per-generation times then include contention for CPU cores.
+    """
+    KittenTTS = _kitten()
 
     print("\n=== KittenTTS Benchmark ===")
 
+    jobs = [sentence for _ in range(iterations) for sentence in sentences]
+    workers = max(1, min(workers, len(jobs)))
+
     # Model loading time
     print("Loading model...", end=" ", flush=True)
     load_start = time.perf_counter()
@@ -81,46 +162,175 @@ def benchmark_kittentts(sentences: list[str], iterations: int = 3) -> dict:
     load_time = time.perf_counter() - load_start
     print(f"done ({load_time:.2f}s)")
 
+    models = [model]
+    if workers > 1:
+        print(f"Loading {workers - 1} more for concurrent workers...",
+              end=" ", flush=True)
+        extra_start = time.perf_counter()
+        models += [KittenTTS("KittenML/kitten-tts-nano-0.2")
+                   for _ in range(workers - 1)]
+        print(f"done ({time.perf_counter() - extra_start:.2f}s)")
+
+    warmup_time = 0.0
+    if warmup > 0:
+        print(f"Warming up ({warmup} run{'s' if warmup != 1 else ''}"
+              f"{' per model' if workers > 1 else ''})...",
+              end=" ", flush=True)
+        warmup_start = time.perf_counter()
+        try:
+            for warm_model in models:
+                for _ in range(warmup):
+                    warm_model.generate("Warming up.", voice="expr-voice-2-f")
+        except Exception as e:
+            print(f"failed ({e})")
+        else:
+            warmup_time = time.perf_counter() - warmup_start
+            print(f"done ({warmup_time:.2f}s)")
+
+    if workers > 1:
+        print(f"Running {workers} generations concurrently")
+
+    # Each task borrows an idle model; with one model per worker thread
+    # a model is never in two generate() calls at once
+    idle_models = queue.SimpleQueue()
+    for idle_model in models:
+        idle_models.put(idle_model)
+
+    def generate(sentence: str):
+        borrowed = idle_models.get()
+        try:
+            return _timed_generate(borrowed, sentence)
+        finally:
+            idle_models.put(borrowed)
+
     results = {
         "model_load_time": load_time,
-        "generation_times": [],
-        "audio_durations": [],
-        "chars_per_second": [],
+        "warmup_time": warmup_time,
+        "workers": workers,
+        **_timing_arrays(len(jobs)),
     }
-
-    for i in range(iterations):
-        print(f"\nIteration {i + 1}/{iterations}")
-        for sentence in sentences:
-            # Generation time
-            gen_start = time.perf_counter()
-            audio = model.generate(sentence, voice="expr-voice-2-f")
-            gen_time = time.perf_counter() - gen_start
-
-            # Audio duration (24kHz sample rate)
-            audio_duration = len(audio) / 24000
-
-            results["generation_times"].append(gen_time)
-            results["audio_durations"].append(audio_duration)
-            results["chars_per_second"].append(len(sentence) / gen_time)
+    gen_ns = results["generation_ns"]
+    audio_durations = results["audio_durations"]
+    chars_per_second = results["chars_per_second"]
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Serial runs skip the pool so timings stay comparable with before
+        mapper = map if workers == 1 else executor.map
+        timed = mapper(generate, jobs)
+        for idx, (elapsed_ns, audio) in enumerate(timed):
+            if idx % len(sentences) == 0:
+                print(f"\nIteration {idx // len(sentences) + 1}/{iterations}")
+            sentence = jobs[idx]
+
+            audio_duration = audio.shape[0] * _INV_KITTEN_SR
+
+            gen_ns[idx] = elapsed_ns
+            gen_time = elapsed_ns * 1e-9
+            audio_durations[idx] = audio_duration
+            chars_per_second[idx] = len(sentence) / gen_time
 
             print(f"  '{sentence[:40]}...' "
                   f"gen={gen_time:.3f}s, audio={audio_duration:.2f}s")
+    results["wall_time"] = time.perf_counter() - wall_start
 
     return results
 
 
+def _wav_info(data: bytes) -> tuple[float, int] | None:
+    """Parse (duration_seconds, sample_rate) from WAV bytes.
+
+    Walks the RIFF chunks rather than assuming a 44-byte header, so extra
+    chunks and any sample rate, channel count or bit depth are handled.
+    Returns None if the data is not an uncompressed (PCM or float) WAV,
+    or if a chunk header is cut short.
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id, size = struct.unpack_from("<4sI", data, pos)
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            if size < 16 or body + 16 > len(data):
+                return None
+            audio_format, channels, sample_rate = struct.unpack_from(
+                "<HHI", data, body
+            )
+            if audio_format not in _UNCOMPRESSED_WAV_FORMATS:
+                return None
+            (bits_per_sample,) = struct.unpack_from("<H", data, body + 14)
+            fmt = (channels, sample_rate, bits_per_sample)
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            channels, sample_rate, bits_per_sample = fmt
+            bytes_per_second = sample_rate * channels * bits_per_sample // 8
+            if not bytes_per_second:
+                return None
+            # Streamed WAVs may carry a placeholder size; trust what arrived
+            available = len(data) - body
+            if size == 0 or size > available:
+                size = available
+            return size / bytes_per_second, sample_rate
+        pos = body + size + (size & 1)  # Chunks are word-aligned
+    return None
+
+
+def _timed_post(session, url: str, body: bytes):
+    """POST one prebuilt form body to pocket-tts.
+
+    The body is streamed so the arrival of the first chunk (time to first
+    byte, what playback waits on) is timed separately from the full
+    download. Returns (elapsed_ns, ttfb_ns, response, body); ttfb_ns is
+    None if the body was empty.
+    """
+    gen_start = time.perf_counter_ns()
+    ttfb_ns = None
+    chunks = []
+    with session.post(
+        url,
+        data=body,
+        headers=_FORM_HEADERS,
+        timeout=30,
+        stream=True,
+    ) as response:
+        for chunk in response.iter_content(4096):
+            if ttfb_ns is None:
+                ttfb_ns = time.perf_counter_ns() - gen_start
+            chunks.append(chunk)
+    return (time.perf_counter_ns() - gen_start, ttfb_ns, response,
+            b"".join(chunks))
+
+
 def benchmark_pocket_tts(sentences: list[str], iterations: int = 3,
-                         host: str = "localhost", port: int = 8000) -> dict:
-    """Benchmark pocket-tts generation times."""
-    import requests
+                         host: str = "localhost", port: int = 8000,
+                         concurrent: bool = False) -> dict:
+    """Benchmark pocket-tts generation times.
+
+    Requests reuse pooled keep-alive connections and, if concurrent,
+    up to POCKET_WORKERS are in flight at once. Concurrent per-request
+    times include any queueing on the server.
+    """
+    requests = _requests()
 
     print("\n=== pocket-tts Benchmark ===")
 
     base_url = f"http://{host}:{port}"
+    jobs = [sentence for _ in range(iterations) for sentence in sentences]
+    workers = max(1, min(POCKET_WORKERS, len(jobs))) if concurrent else 1
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1, pool_maxsize=workers
+    )
+    session.mount("http://", adapter)
 
     # Check if server is running
     try:
-        health = requests.get(f"{base_url}/health", timeout=2)
+        health = session.get(f"{base_url}/health", timeout=2)
         if health.status_code != 200:
             print(f"pocket-tts server not healthy at {base_url}")
             return None
@@ -129,87 +339,130 @@ def benchmark_pocket_tts(sentences: list[str], iterations: int = 3,
         print("Start it with: uvx pocket-tts serve")
         return None
 
-    print(f"Server running at {base_url}")
+    mode = "sequential" if workers == 1 else f"{workers} concurrent requests"
+    print(f"Server running at {base_url} ({mode})")
 
     results = {
-        "generation_times": [],
-        "audio_durations": [],
-        "chars_per_second": [],
+        "workers": workers,
+        **_timing_arrays(len(jobs)),
+        "ttfb_ns": np.full(len(jobs), _NO_TIME, dtype=np.int64),
+        "sample_rate": None,
     }
-
-    for i in range(iterations):
-        print(f"\nIteration {i + 1}/{iterations}")
-        for sentence in sentences:
-            # Generation time (includes network overhead)
-            gen_start = time.perf_counter()
-            response = requests.post(
-                f"{base_url}/tts",
-                data={"text": sentence},  # multipart/form-data, not JSON
-                timeout=30,
-            )
-            gen_time = time.perf_counter() - gen_start
+    ttfb_ns = results["ttfb_ns"]
+    gen_ns = results["generation_ns"]
+    audio_durations = results["audio_durations"]
+    chars_per_second = results["chars_per_second"]
+
+    tts_url = f"{base_url}/tts"
+    # Form-encode each distinct sentence once rather than on every request
+    bodies = {s: urlencode({"text": s}).encode() for s in sentences}
+    wall_start = time.perf_counter()
+    with session, ThreadPoolExecutor(max_workers=workers) as executor:
+        # map() yields in submission order, so output stays grouped
+        timed = executor.map(
+            lambda sentence: _timed_post(session, tts_url, bodies[sentence]),
+            jobs,
+        )
+        for idx, (elapsed_ns, first_ns, response, audio_data) in enumerate(timed):
+            if idx % len(sentences) == 0:
+                print(f"\nIteration {idx // len(sentences) + 1}/{iterations}")
+            sentence = jobs[idx]
 
             if response.status_code != 200:
                 print(f"  Error: {response.status_code}")
                 continue
 
-            # Get audio duration from WAV data
-            audio_data = response.content
-            # WAV header: sample rate at bytes 24-28, data size can be calculated
-            # For simplicity, estimate from file size (16-bit, mono)
-            # Actual sample rate from pocket-tts is typically 22050 or 24000
-            audio_duration = (len(audio_data) - 44) / (2 * 24000)  # Rough estimate
-
-            results["generation_times"].append(gen_time)
-            results["audio_durations"].append(audio_duration)
-            results["chars_per_second"].append(len(sentence) / gen_time)
+            # Get audio duration from the WAV header
+            info = _wav_info(audio_data)
+            if info is not None:
+                audio_duration, results["sample_rate"] = info
+            else:
+                # Not a parseable WAV: estimate as 16-bit mono at 24kHz
+                audio_duration = (len(audio_data) - 44) / (2 * 24000)
+
+            gen_ns[idx] = elapsed_ns
+            gen_time = elapsed_ns * 1e-9
+            audio_durations[idx] = audio_duration
+            chars_per_second[idx] = len(sentence) / gen_time
+            if first_ns is not None:
+                ttfb_ns[idx] = first_ns
 
             print(f"  '{sentence[:40]}...' "
                   f"gen={gen_time:.3f}s, audio={audio_duration:.2f}s")
+    results["wall_time"] = time.perf_counter() - wall_start
 
     return results
 
 
+def _geomean(values: np.ndarray) -> float:
+    """Geometric mean; less swayed by a few slow outliers than the mean."""
+    return float(np.exp(np.log(values).mean()))
+
+
+def _print_generation_times(times: np.ndarray):
+    """Print the geometric mean, tail percentiles and range of timings."""
+    p50, p95, p99 = np.percentile(times, [50, 95, 99])
+    print(f"  Generation time:     {_geomean(times):.3f}s (geometric mean)")
+    print(f"  p50/p95/p99:         {p50:.3f}s / {p95:.3f}s / {p99:.3f}s")
+    print(f"  Min/Max:             {times.min():.3f}s / {times.max():.3f}s")
+
+
 def print_summary(kitten_results: dict | None, pocket_results: dict | None):
     """Print comparison summary."""
     print("\n" + "=" * 60)
     print("BENCHMARK SUMMARY")
     print("=" * 60)
 
-    if kitten_results and len(kitten_results.get("generation_times", [])) > 0:
-        gen_times = kitten_results["generation_times"]
+    kitten_times = (
+        _seconds(kitten_results["generation_ns"]) if kitten_results else None
+    )
+    pocket_times = (
+        _seconds(pocket_results["generation_ns"]) if pocket_results else None
+    )
+    kitten_has_data = kitten_times is not None and kitten_times.size > 0
+    pocket_has_data = pocket_times is not None and pocket_times.size > 0
+
+    if kitten_has_data:
         print(f"\nKittenTTS:")
         print(f"  Model load time:     {kitten_results['model_load_time']:.2f}s")
-        print(f"  Generation time:     {np.mean(gen_times):.3f}s "
-              f"(±{np.std(gen_times):.3f}s)")
-        print(f"  Min/Max:             {np.min(gen_times):.3f}s / "
-              f"{np.max(gen_times):.3f}s")
-        print(f"  Chars/second:        {np.mean(kitten_results['chars_per_second']):.1f}")
+        if kitten_results["warmup_time"]:
+            print(f"  Warmup time:         {kitten_results['warmup_time']:.2f}s "
+                  f"(excluded)")
+        _print_generation_times(kitten_times)
+        print(f"  Chars/second:        "
+              f"{_finite(kitten_results['chars_per_second']).mean():.1f}")
+        print(f"  Wall time:           {kitten_results['wall_time']:.2f}s")
     elif kitten_results:
         print(f"\nKittenTTS: No generation data (model may have failed)")
 
-    if pocket_results and len(pocket_results.get("generation_times", [])) > 0:
-        gen_times = pocket_results["generation_times"]
+    if pocket_has_data:
         print(f"\npocket-tts:")
-        print(f"  Generation time:     {np.mean(gen_times):.3f}s "
-              f"(±{np.std(gen_times):.3f}s)")
-        print(f"  Min/Max:             {np.min(gen_times):.3f}s / "
-              f"{np.max(gen_times):.3f}s")
-        print(f"  Chars/second:        {np.mean(pocket_results['chars_per_second']):.1f}")
+        _print_generation_times(pocket_times)
+        print(f"  Chars/second:        "
+              f"{_finite(pocket_results['chars_per_second']).mean():.1f}")
+        ttfbs = _seconds(pocket_results["ttfb_ns"])
+        if ttfbs.size:
+            p50, p95 = np.percentile(ttfbs, [50, 95])
+            print(f"  First byte p50/p95:  {p50:.3f}s / {p95:.3f}s")
+        print(f"  Wall time:           {pocket_results['wall_time']:.2f}s")
+        if pocket_results["sample_rate"]:
+            print(f"  Sample rate:         {pocket_results['sample_rate']} Hz")
     elif pocket_results:
         print(f"\npocket-tts: No generation data (server may not be running)")
 
-    kitten_has_data = kitten_results and len(kitten_results.get("generation_times", [])) > 0
-    pocket_has_data = pocket_results and len(pocket_results.get("generation_times", [])) > 0
-
-    if kitten_has_data and pocket_has_data:
-        kitten_avg = np.mean(kitten_results["generation_times"])
-        pocket_avg = np.mean(pocket_results["generation_times"])
-        diff = pocket_avg - kitten_avg
-        faster = "KittenTTS" if diff > 0 else "pocket-tts"
-        pct = abs(diff) / max(kitten_avg, pocket_avg) * 100
-        print(f"\n{faster} is {pct:.1f}% faster on average")
-        print(f"  (KittenTTS: {kitten_avg:.3f}s vs pocket-tts: {pocket_avg:.3f}s)")
+    if (kitten_has_data and pocket_has_data
+            and kitten_results["workers"] != pocket_results["workers"]):
+        # Concurrent latencies include queueing; don't rank against serial
+        print(f"\nNo speed comparison: KittenTTS ran "
+              f"{kitten_results['workers']} at a time, pocket-tts "
+              f"{pocket_results['workers']} at a time")
+    elif kitten_has_data and pocket_has_data:
+        kitten_g = _geomean(kitten_times)
+        pocket_g = _geomean(pocket_times)
+        faster = "KittenTTS" if pocket_g > kitten_g else "pocket-tts"
+        pct = (1 - min(kitten_g, pocket_g) / max(kitten_g, pocket_g)) * 100
+        print(f"\n{faster} is {pct:.1f}% faster (geometric mean)")
+        print(f"  (KittenTTS: {kitten_g:.3f}s vs pocket-tts: {pocket_g:.3f}s)")
     elif not kitten_has_data and not pocket_has_data:
         print("\nNo benchmark data collected!")
     elif not pocket_has_data:
@@ -226,9 +479,19 @@ def main():
                         help="Only benchmark KittenTTS")
     parser.add_argument("--pocket-only", action="store_true",
                         help="Only benchmark pocket-tts")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="Untimed KittenTTS runs before measuring "
+                             "(default: 1)")
+    parser.add_argument("--concurrent", action="store_true",
+                        help=f"Send up to {POCKET_WORKERS} pocket-tts requests "
+                             f"at once (not comparable with serial KittenTTS)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Concurrent KittenTTS generations sharing one "
+                             "model (default: 1, serial)")
     args = parser.parse_args()
 
-    if not check_dependencies():
+    if not check_dependencies(kitten=not args.pocket_only,
+                              pocket=not args.kitten_only):
         sys.exit(1)
 
     print("TTS Benchmark - Voice Summary Scenario")
@@ -238,10 +501,15 @@ def main():
     pocket_results = None
 
     if not args.pocket_only:
-        kitten_results = benchmark_kittentts(TEST_SENTENCES, args.iterations)
+        kitten_results = benchmark_kittentts(
+            TEST_SENTENCES, args.iterations, warmup=args.warmup,
+            workers=args.workers,
+        )
 
     if not args.kitten_only:
-        pocket_results = benchmark_pocket_tts(TEST_SENTENCES, args.iterations)
+        pocket_results = benchmark_pocket_tts(
+            TEST_SENTENCES, args.iterations, concurrent=args.concurrent
+        )
 
     print_summary(kitten_results, pocket_results)
 
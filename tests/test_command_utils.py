@@ -1,4 +1,6 @@
 """Tests for command_utils functions."""
+import os
+import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch
@@ -156,3 +158,76 @@ class TestExpandCommandAliases:
         """Handles semicolon separated commands."""
         result = expand_command_aliases("gs; gco main")
         assert result == "git status; git checkout main"
+
+    def test_no_candidates_skips_alias_load(self):
+        """Known commands and paths never trigger the alias load."""
+        command = "git status && rm -f x | /usr/bin/wc -l"
+        with patch.object(command_utils, "_alias_cache", None), \
+             patch.object(command_utils, "_load_alias_cache",
+                          side_effect=AssertionError("aliases loaded")):
+            assert expand_command_aliases(command) == command
+
+
+class TestAliasDiskCache:
+    """Tests for reusing parsed aliases across hook processes."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_home(self, tmp_path, monkeypatch):
+        """Point the rc file and alias cache at a temp home dir."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+        monkeypatch.setenv("SHELL", "/bin/bash")
+        monkeypatch.setattr(command_utils, "_alias_cache", None)
+        rc = tmp_path / ".bashrc"
+        rc.write_text("alias gs='git status'\n")
+        return rc
+
+    def _run_shell(self, monkeypatch, stdout):
+        """Replace the shell call, recording how often it runs."""
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, stdout, "")
+
+        monkeypatch.setattr(subprocess, "run", fake_run)
+        return calls
+
+    def test_second_process_skips_shell(self, monkeypatch):
+        """A fresh process reuses the saved aliases without a shell."""
+        calls = self._run_shell(monkeypatch, "alias gs='git status'\n")
+        assert command_utils._load_alias_cache() == {"gs": "git status"}
+        assert len(calls) == 1
+
+        monkeypatch.setattr(command_utils, "_alias_cache", None)
+        assert command_utils._load_alias_cache() == {"gs": "git status"}
+        assert len(calls) == 1
+
+    def test_parses_bash_and_zsh_quoting(self, monkeypatch):
+        """Only a matching pair of outer quotes is removed."""
+        self._run_shell(monkeypatch, (
+            "alias gs='git status'\n"
+            "hi='echo \"hi\"'\n"
+            'say="echo \'x\'"\n'
+            "  alias  ll = ls -la\n"
+            "noquote=ls'\n"
+        ))
+        assert command_utils._load_alias_cache() == {
+            "gs": "git status",
+            "hi": 'echo "hi"',
+            "say": "echo 'x'",
+            "ll": "ls -la",
+            "noquote": "ls'",
+        }
+
+    def test_rc_change_reloads(self, monkeypatch, isolated_home):
+        """Editing the rc file invalidates the saved aliases."""
+        self._run_shell(monkeypatch, "alias gs='git status'\n")
+        command_utils._load_alias_cache()
+
+        st = isolated_home.stat()
+        os.utime(isolated_home, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        monkeypatch.setattr(command_utils, "_alias_cache", None)
+        calls = self._run_shell(monkeypatch, "alias ll='ls -la'\n")
+        assert command_utils._load_alias_cache() == {"ll": "ls -la"}
+        assert len(calls) == 1
@@ -0,0 +1,466 @@
+"""Tests for fix_session orphan-parent repair."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from claude_code_tools import fix_session
+from claude_code_tools.fix_session import (
+    analyze_session,
+    check_and_fix_session,
+    check_and_fix_sessions,
+    find_previous_conversation_uuid,
+    fix_conversation_chain,
+    load_session,
+    verify_fix,
+    write_session,
+)
+
+
+def _broken_entries() -> list[dict]:
+    """Session where a progress entry contaminates the chain."""
+    return [
+        {"type": "user", "uuid": "u1", "parentUuid": None},
+        {"type": "assistant", "uuid": "a1", "parentUuid": "u1"},
+        {"type": "progress", "uuid": "p1", "parentUuid": "a1"},
+        {"type": "user", "uuid": "u2", "parentUuid": "p1"},
+        {"type": "assistant", "uuid": "a2", "parentUuid": "u2"},
+    ]
+
+
+@pytest.fixture
+def broken_session(tmp_path: Path) -> Path:
+    """Write a broken session JSONL file."""
+    path = tmp_path / "session.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in _broken_entries():
+            f.write(json.dumps(entry) + "\n")
+        f.write("\n")  # Trailing blank line is ignored
+    return path
+
+
+class TestLoadSession:
+    """Tests for load_session."""
+
+    def test_loads_all_entries(self, broken_session):
+        """Every non-blank line becomes an entry."""
+        assert load_session(broken_session) == _broken_entries()
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_lines_orjson_cannot_read_exactly(
+        self, tmp_path, monkeypatch, use_orjson
+    ):
+        """Lone surrogates and >64-bit integers load as stdlib json does."""
+        if use_orjson and not fix_session.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(fix_session, "ORJSON_AVAILABLE", use_orjson)
+        lines = [
+            '{"m":"cut \\ud83d"}',
+            '{"n":123456789012345678901234,"m":-9223372036854775809}',
+            '{"type":"user","uuid":"u1","parentUuid":null}',
+        ]
+        path = tmp_path / "session.jsonl"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        assert load_session(path) == [json.loads(line) for line in lines]
+
+    def test_missing_file_raises(self, tmp_path):
+        """Missing files raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_session(tmp_path / "missing.jsonl")
+
+
+class TestAnalyzeSession:
+    """Tests for analyze_session."""
+
+    def test_detects_orphan(self):
+        """Conversation entry parented to progress is an orphan."""
+        analysis = analyze_session(_broken_entries())
+        stats = analysis["stats"]
+        assert stats["total_entries"] == 5
+        assert stats["conversation_entries"] == 4
+        assert stats["orphan_count"] == 1
+        assert analysis["orphan_conv_entries"][0]["file_idx"] == 3
+        assert analysis["orphan_conv_entries"][0]["parent_type"] == "progress"
+
+    def test_chain_break(self):
+        """Chain walk from the end stops at the orphan."""
+        analysis = analyze_session(_broken_entries())
+        assert analysis["chain_length"] == 2
+        assert analysis["chain_break"]["orphan_parent"] == "p1"
+
+    def test_healthy_session(self):
+        """Healthy session has no orphans and a full chain."""
+        entries = [
+            {"type": "user", "uuid": "u1", "parentUuid": None},
+            {"type": "assistant", "uuid": "a1", "parentUuid": "u1"},
+        ]
+        analysis = analyze_session(entries)
+        assert analysis["stats"]["orphan_count"] == 0
+        assert analysis["chain_length"] == 2
+        assert analysis["chain_break"] is None
+
+    def test_parent_later_in_file(self):
+        """Chain length is correct when a parent appears after its child."""
+        entries = [
+            {"type": "user", "uuid": "u1", "parentUuid": None},
+            {"type": "assistant", "uuid": "a2", "parentUuid": "u2"},
+            {"type": "user", "uuid": "u2", "parentUuid": "u1"},
+            {"type": "assistant", "uuid": "a3", "parentUuid": "a2"},
+        ]
+        analysis = analyze_session(entries)
+        assert analysis["chain_length"] == 4
+        assert analysis["chain_break"] is None
+
+    def test_reused_uuid_follows_last_entry(self):
+        """A repeated UUID resolves to its last entry, as in a full walk."""
+        entries = [
+            {"type": "user", "uuid": "a", "parentUuid": None},
+            {"type": "assistant", "uuid": "b", "parentUuid": "a"},
+            {"type": "user", "uuid": "a", "parentUuid": "p"},
+            {"type": "progress", "uuid": "p"},
+            {"type": "user", "uuid": "c", "parentUuid": "b"},
+        ]
+        analysis = analyze_session(entries)
+        assert analysis["chain_length"] == 3
+        assert analysis["chain_break"]["after_length"] == 3
+        assert analysis["chain_break"]["orphan_parent"] == "p"
+
+    def test_empty_session(self):
+        """Empty session analyzes cleanly."""
+        analysis = analyze_session([])
+        assert analysis["stats"]["orphan_count"] == 0
+        assert analysis["chain_length"] == 0
+
+
+class TestFixConversationChain:
+    """Tests for fix_conversation_chain."""
+
+    def test_relinks_to_previous_conversation_entry(self):
+        """Orphan is relinked to the previous conversation entry."""
+        entries = _broken_entries()
+        fixed, fixes_made = fix_conversation_chain(analyze_session(entries))
+        assert fixes_made == 1
+        assert fixed[3]["parentUuid"] == "a1"
+        # Original entries are not mutated
+        assert entries[3]["parentUuid"] == "p1"
+
+        verify = analyze_session(fixed)
+        assert verify["stats"]["orphan_count"] == 0
+        assert verify["chain_break"] is None
+        assert verify["chain_length"] == 4
+
+    def test_first_conversation_entry_gets_null_parent(self):
+        """Orphan with no earlier conversation entry becomes a root."""
+        entries = [
+            {"type": "progress", "uuid": "p0"},
+            {"type": "user", "uuid": "u1", "parentUuid": "p0"},
+        ]
+        fixed, fixes_made = fix_conversation_chain(analyze_session(entries))
+        assert fixes_made == 1
+        assert fixed[1]["parentUuid"] is None
+
+
+class TestVerifyFix:
+    """Tests for incremental verification of a fix."""
+
+    @pytest.mark.parametrize(
+        "entries",
+        [
+            _broken_entries(),
+            [
+                {"type": "progress", "uuid": "p0"},
+                {"type": "user", "uuid": "u1", "parentUuid": "p0"},
+                {"type": "assistant", "uuid": "a1", "parentUuid": "u1"},
+                {"type": "progress", "uuid": "p1", "parentUuid": "a1"},
+                {"type": "user", "uuid": "u2", "parentUuid": "p1"},
+                {"type": "user", "uuid": "u3", "parentUuid": "gone"},
+            ],
+            # Relinked entry whose UUID is reused later in the file
+            [
+                {"type": "user", "uuid": "u1", "parentUuid": None},
+                {"type": "progress", "uuid": "p1"},
+                {"type": "user", "uuid": "a", "parentUuid": "p1"},
+                {"type": "assistant", "uuid": "b", "parentUuid": "u1"},
+                {"type": "user", "uuid": "a", "parentUuid": "b"},
+                {"type": "user", "uuid": "c", "parentUuid": "a"},
+            ],
+        ],
+    )
+    def test_matches_full_reanalysis(self, entries):
+        """verify_fix agrees with analyze_session on the fixed entries."""
+        analysis = analyze_session(entries)
+        fixed, _ = fix_conversation_chain(analysis)
+        indices = [o["file_idx"] for o in analysis["orphan_conv_entries"]]
+
+        verify = verify_fix(analysis, fixed, indices)
+        full = analyze_session(fixed)
+        assert verify["stats"] == full["stats"]
+        assert verify["chain_break"] == full["chain_break"]
+
+
+class TestWriteSession:
+    """Tests for write_session."""
+
+    def test_round_trip(self, tmp_path):
+        """Written sessions load back identically."""
+        path = tmp_path / "out.jsonl"
+        entries = _broken_entries()
+        write_session(entries, path)
+        assert load_session(path) == entries
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_multiple_chunks(self, tmp_path, monkeypatch, use_orjson):
+        """Entries spanning several write chunks are all written."""
+        if use_orjson and not fix_session.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(fix_session, "ORJSON_AVAILABLE", use_orjson)
+        monkeypatch.setattr(fix_session, "WRITE_CHUNK_SIZE", 2)
+        path = tmp_path / "out.jsonl"
+        entries = _broken_entries()
+        write_session(entries, path)
+        lines = path.read_bytes().splitlines()
+        assert len(lines) == len(entries)
+        assert [json.loads(line) for line in lines] == entries
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_round_trip_values_orjson_cannot_encode(
+        self, tmp_path, monkeypatch, use_orjson
+    ):
+        """Lone surrogates and >64-bit integers survive a rewrite."""
+        if use_orjson and not fix_session.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(fix_session, "ORJSON_AVAILABLE", use_orjson)
+        path = tmp_path / "out.jsonl"
+        entries = [
+            {"m": "cut \ud83d"},
+            {"n": 123456789012345678901234},
+            *_broken_entries(),
+        ]
+        write_session(entries, path)
+        assert load_session(path) == entries
+
+
+class TestPreviousConversationUuid:
+    """Tests for the precomputed previous-UUID map."""
+
+    def test_matches_linear_scan(self):
+        """prev_conv_uuid_for agrees with find_previous_conversation_uuid."""
+        entries = _broken_entries()
+        analysis = analyze_session(entries)
+        pairs = list(zip(analysis["conv_file_idx"], analysis["conv_entry"]))
+        for file_idx in analysis["conv_file_idx"]:
+            assert analysis["prev_conv_uuid_for"][file_idx] == (
+                find_previous_conversation_uuid(pairs, file_idx)
+            )
+
+
+class TestCheckAndFixSession:
+    """Tests for the check_and_fix_session library API."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_home(self, tmp_path, monkeypatch):
+        """Keep the healthy-session cache out of the real home dir."""
+        home = tmp_path / "home"
+        home.mkdir()
+        monkeypatch.setenv("HOME", str(home))
+        return home
+
+    def test_fixes_in_place_with_backup(self, broken_session):
+        """Broken session is fixed in place and a .bak is created."""
+        original = broken_session.read_bytes()
+        assert check_and_fix_session(broken_session) is True
+
+        backup = broken_session.with_suffix(".jsonl.bak")
+        assert backup.read_bytes() == original
+        analysis = analyze_session(load_session(broken_session))
+        assert analysis["stats"]["orphan_count"] == 0
+
+    def test_backup_survives_rewrite(self, broken_session):
+        """Backup keeps the original bytes after repeated fixes."""
+        original = broken_session.read_bytes()
+        check_and_fix_session(broken_session)
+        backup = broken_session.with_suffix(".jsonl.bak")
+        # A stale backup from an earlier run is replaced, not appended
+        with open(broken_session, "wb") as f:
+            f.write(original)
+        assert check_and_fix_session(broken_session) is True
+        assert backup.read_bytes() == original
+        assert broken_session.read_bytes() != original
+        assert not list(broken_session.parent.glob(".*.tmp"))
+
+    def test_symlinked_session_fixed_through_link(self, broken_session):
+        """Fixing via a symlink rewrites the target and keeps the link."""
+        link = broken_session.with_name("link.jsonl")
+        link.symlink_to(broken_session)
+        original = broken_session.read_bytes()
+
+        assert check_and_fix_session(link) is True
+        assert link.is_symlink()
+        analysis = analyze_session(load_session(broken_session))
+        assert analysis["stats"]["orphan_count"] == 0
+        assert link.with_suffix(".jsonl.bak").read_bytes() == original
+
+    def test_failed_backup_keeps_previous_backup(
+        self, broken_session, monkeypatch
+    ):
+        """An earlier .bak is kept when a new snapshot cannot be made."""
+        import shutil
+
+        backup = broken_session.with_suffix(".jsonl.bak")
+        backup.write_bytes(b"previous backup\n")
+
+        def fail(*_args):
+            raise OSError("no space")
+
+        monkeypatch.setattr(fix_session.os, "link", fail)
+        monkeypatch.setattr(shutil, "copyfile", fail)
+        with pytest.raises(OSError):
+            check_and_fix_session(broken_session)
+        assert backup.read_bytes() == b"previous backup\n"
+        assert not list(broken_session.parent.glob(".*.tmp"))
+
+    def test_healthy_session_untouched(self, broken_session):
+        """Second call finds nothing to fix."""
+        check_and_fix_session(broken_session)
+        assert check_and_fix_session(broken_session) is False
+
+    def test_missing_file(self, tmp_path):
+        """Missing session returns False instead of raising."""
+        assert check_and_fix_session(tmp_path / "missing.jsonl") is False
+
+    def test_unchanged_healthy_session_skips_parse(
+        self, broken_session, monkeypatch
+    ):
+        """Cached healthy session is not parsed again."""
+        check_and_fix_session(broken_session)
+        assert check_and_fix_session(broken_session) is False
+
+        def fail(_path):
+            raise AssertionError("session should not be re-parsed")
+
+        monkeypatch.setattr(fix_session, "load_session", fail)
+        assert check_and_fix_session(broken_session) is False
+
+    def test_modified_session_is_reanalyzed(self, broken_session):
+        """A changed file invalidates the cache entry."""
+        check_and_fix_session(broken_session)
+        with open(broken_session, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "type": "user", "uuid": "u3", "parentUuid": "p1",
+            }) + "\n")
+        assert check_and_fix_session(broken_session) is True
+
+    def test_append_during_check_is_not_cached(
+        self, tmp_path, monkeypatch
+    ):
+        """A version appended to after parsing is re-checked later."""
+        path = tmp_path / "session.jsonl"
+        write_session(
+            [{"type": "user", "uuid": "u1", "parentUuid": None}], path
+        )
+        real_load = fix_session.load_session
+
+        def load_then_append(session_path):
+            entries = real_load(session_path)
+            with open(session_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"type": "progress", "uuid": "p1"}) + "\n")
+                f.write(json.dumps({
+                    "type": "user", "uuid": "u2", "parentUuid": "p1",
+                }) + "\n")
+            return entries
+
+        monkeypatch.setattr(fix_session, "load_session", load_then_append)
+        assert check_and_fix_session(path) is False
+
+        monkeypatch.setattr(fix_session, "load_session", real_load)
+        assert check_and_fix_session(path) is True
+        analysis = analyze_session(load_session(path))
+        assert analysis["stats"]["orphan_count"] == 0
+
+    def test_one_cache_entry_per_session(self, broken_session, isolated_home):
+        """Rechecking a changing session keeps a single cache entry."""
+        check_and_fix_session(broken_session)
+        for i in range(3):
+            with open(broken_session, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "type": "progress", "uuid": f"x{i}",
+                }) + "\n")
+            assert check_and_fix_session(broken_session) is False
+        cache_dir = isolated_home / ".cctools" / "fix_session_cache"
+        assert len(list(cache_dir.glob("*.json"))) == 1
+
+
+class TestCheckAndFixSessions:
+    """Tests for batch fixing across many session files."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_home(self, tmp_path, monkeypatch):
+        """Keep the healthy-session cache out of the real home dir."""
+        home = tmp_path / "home"
+        home.mkdir()
+        monkeypatch.setenv("HOME", str(home))
+        return home
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_results_in_input_order(self, tmp_path, workers):
+        """Only broken sessions report a fix, in input order."""
+        healthy = tmp_path / "healthy.jsonl"
+        write_session(
+            [{"type": "user", "uuid": "u1", "parentUuid": None}], healthy
+        )
+        broken = []
+        for name in ("b1", "b2"):
+            path = tmp_path / f"{name}.jsonl"
+            write_session(_broken_entries(), path)
+            broken.append(path)
+
+        paths = [broken[0], healthy, broken[1]]
+        results = check_and_fix_sessions(paths, workers=workers)
+        assert results == [True, False, True]
+
+    def test_cache_pruned_to_live_sessions(self, tmp_path, isolated_home):
+        """Entries for deleted sessions are dropped by the next batch."""
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"s{i}.jsonl"
+            write_session(
+                [{"type": "user", "uuid": "u1", "parentUuid": None}], path
+            )
+            paths.append(path)
+        cache_dir = isolated_home / ".cctools" / "fix_session_cache"
+
+        check_and_fix_sessions(paths, workers=1)
+        assert len(list(cache_dir.glob("*.json"))) == 5
+
+        for path in paths[:3]:
+            path.unlink()
+        check_and_fix_sessions(paths[3:], workers=1)
+        assert len(list(cache_dir.glob("*.json"))) == 2
+
+    def test_parallel_batch_caches_every_healthy_session(
+        self, tmp_path, isolated_home, monkeypatch
+    ):
+        """Workers' healthy results all reach the cache; reruns skip them."""
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"s{i}.jsonl"
+            entries = (
+                _broken_entries()
+                if i % 2
+                else [{"type": "user", "uuid": "u1", "parentUuid": None}]
+            )
+            write_session(entries, path)
+            paths.append(path)
+
+        assert check_and_fix_sessions(paths, workers=2) == [
+            False, True, False, True, False, True,
+        ]
+        cache_dir = isolated_home / ".cctools" / "fix_session_cache"
+        assert len(list(cache_dir.glob("*.json"))) == 6
+
+        def fail(_path):
+            raise AssertionError("session should not be re-checked")
+
+        monkeypatch.setattr(fix_session, "_check_and_fix_uncached", fail)
+        assert check_and_fix_sessions(paths, workers=2) == [False] * 6